@@ -23,7 +23,10 @@ CREATE OR REPLACE TABLE DEMO.DEMO.NYC_CAMERA_DATA (
     ingest_timestamp TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP(),
     hostname STRING,
     ip_address STRING
-);
+)
+-- Dashboards read the last 24 hours and then each camera's latest row, so
+-- cluster by day first for pruning and camera second for the join back
+CLUSTER BY (TO_DATE(image_timestamp), camera_id);
 
 -- Create Iceberg table (requires external volume)
 -- Update EXTERNAL_VOLUME to your volume name
@@ -0,0 +1,146 @@
+-- ============================================================================
+-- NYC TRAFFIC DATA PLATFORM - DASHBOARD DYNAMIC TABLES
+-- ============================================================================
+-- Pre-aggregated tables behind the dashboards' history-wide charts.
+-- Snowflake refreshes them incrementally, so the dashboard reads a handful of
+-- rows instead of scanning the raw tables on every cache miss.
+-- ============================================================================
+
+USE DATABASE DEMO;
+USE SCHEMA DEMO;
+USE WAREHOUSE INGEST;
+
+-- ============================================================================
+-- 1. EVENTS BY TYPE
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.EVENTS_BY_TYPE_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    event_type,
+    COUNT(*) as event_count
+FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
+GROUP BY event_type;
+
+-- ============================================================================
+-- 2. EVENTS BY ROADWAY
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.EVENTS_BY_ROADWAY_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    roadway_name,
+    COUNT(*) as event_count,
+    COUNT(DISTINCT event_type) as event_types
+FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
+WHERE roadway_name IS NOT NULL AND roadway_name != ''
+GROUP BY roadway_name;
+
+-- ============================================================================
+-- 3. EVENTS BY SEVERITY
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.EVENTS_BY_SEVERITY_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    COALESCE(severity, 'Unknown') as severity,
+    COUNT(*) as event_count
+FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
+GROUP BY severity;
+
+-- ============================================================================
+-- 4. SPEED BY ROADWAY
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.SPEED_BY_ROADWAY_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    roadway_name,
+    ROUND(AVG(current_speed), 1) as avg_speed,
+    ROUND(AVG(free_flow_speed), 1) as avg_free_flow,
+    ROUND(AVG(CASE WHEN free_flow_speed > 0
+              THEN current_speed / free_flow_speed ELSE NULL END) * 100, 1) as flow_pct,
+    COUNT(DISTINCT segment_id) as segments
+FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
+WHERE roadway_name IS NOT NULL AND roadway_name != ''
+GROUP BY roadway_name;
+
+-- ============================================================================
+-- 5. CAMERA OVERVIEW
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.CAMERA_OVERVIEW_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    COUNT(*) as total_records,
+    COUNT(DISTINCT camera_id) as unique_cameras,
+    COUNT(DISTINCT roadway_name) as unique_roadways,
+    MIN(image_timestamp) as first_capture,
+    MAX(image_timestamp) as last_capture
+FROM DEMO.DEMO.NYC_CAMERA_DATA;
+
+-- ============================================================================
+-- 6. CAMERAS BY ROADWAY
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.CAMERAS_BY_ROADWAY_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    roadway_name,
+    COUNT(DISTINCT camera_id) as camera_count,
+    COUNT(*) as total_captures,
+    ROUND(AVG(latitude), 4) as avg_latitude,
+    ROUND(AVG(longitude), 4) as avg_longitude
+FROM DEMO.DEMO.NYC_CAMERA_DATA
+WHERE roadway_name IS NOT NULL AND roadway_name != ''
+GROUP BY roadway_name;
+
+-- ============================================================================
+-- 7. CAMERA CAPTURES BY HOUR
+-- ============================================================================
+-- Keeps every hour; the dashboard filters to the last 7 days when it reads,
+-- since a dynamic table cannot depend on CURRENT_TIMESTAMP().
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.CAMERA_CAPTURES_BY_HOUR_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  CLUSTER BY (capture_hour)
+  AS
+SELECT
+    DATE_TRUNC('hour', image_timestamp) as capture_hour,
+    COUNT(*) as capture_count
+FROM DEMO.DEMO.NYC_CAMERA_DATA
+GROUP BY capture_hour;
+
+-- ============================================================================
+-- 8. CAMERAS BY DIRECTION
+-- ============================================================================
+
+CREATE OR REPLACE DYNAMIC TABLE DEMO.DEMO.CAMERAS_BY_DIRECTION_DT
+  TARGET_LAG = '2 minutes'
+  WAREHOUSE = INGEST
+  AS
+SELECT
+    COALESCE(direction_of_travel, 'Unknown') as direction,
+    COUNT(DISTINCT camera_id) as camera_count,
+    COUNT(*) as total_captures
+FROM DEMO.DEMO.NYC_CAMERA_DATA
+GROUP BY direction_of_travel;
+
+-- ============================================================================
+-- VERIFY
+-- ============================================================================
+
+SHOW DYNAMIC TABLES IN SCHEMA DEMO.DEMO;
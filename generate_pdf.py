@@ -6,21 +6,44 @@ Generates a professional PDF document from the project documentation
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.lib.utils import simpleSplit
 from reportlab.lib.colors import HexColor, black, white
 from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, 
-    PageBreak, Image, ListFlowable, ListItem
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    PageBreak, XPreformatted, Flowable
 )
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.pdfgen import canvas
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+import copy
+from functools import lru_cache, partial
+import io
 import os
 
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:  # pypdf ships with the optional "pdf" extra
+    PdfReader = PdfWriter = None
+
 BLADE_RUNNER_BLUE = HexColor('#00d4ff')
 BLADE_RUNNER_ORANGE = HexColor('#ff6b35')
 BLADE_RUNNER_DARK = HexColor('#1a1a2e')
 BLADE_RUNNER_GRAY = HexColor('#16213e')
 
+TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'NYC_Camera_Pipeline_Documentation.template.pdf'
+)
+
+TEXT_DARK = HexColor('#333333')
+TEXT_MUTED = HexColor('#666666')
+GRID_GRAY = HexColor('#cccccc')
+BG_WHITE = HexColor('#ffffff')
+BG_LIGHT = HexColor('#f5f5f5')
+BG_ALT = HexColor('#f9f9f9')
+
+@lru_cache(maxsize=1)
 def create_styles():
     styles = getSampleStyleSheet()
     
@@ -79,8 +102,8 @@ def create_styles():
         name='CodeBlock',
         parent=styles['Code'],
         fontSize=8,
-        textColor=HexColor('#333333'),
-        backColor=HexColor('#f5f5f5'),
+        textColor=TEXT_DARK,
+        backColor=BG_LIGHT,
         borderPadding=8,
         spaceAfter=10,
         fontName='Courier'
@@ -90,7 +113,7 @@ def create_styles():
         name='Quote',
         parent=styles['Normal'],
         fontSize=10,
-        textColor=HexColor('#666666'),
+        textColor=TEXT_MUTED,
         fontName='Helvetica-Oblique',
         leftIndent=20,
         rightIndent=20,
@@ -109,81 +132,415 @@ def create_styles():
     
     return styles
 
-def add_header_footer(canvas, doc):
+def add_header_footer(canvas, doc, generated_at, page_numbers=True):
+    page_width, page_height = letter
+    margin = inch
     canvas.saveState()
     canvas.setFillColor(BLADE_RUNNER_DARK)
-    canvas.rect(0, letter[1] - 40, letter[0], 40, fill=1, stroke=0)
+    canvas.rect(0, page_height - 40, page_width, 40, fill=1, stroke=0)
     canvas.setFillColor(BLADE_RUNNER_BLUE)
     canvas.setFont('Helvetica-Bold', 10)
-    canvas.drawString(inch, letter[1] - 25, "NYC Camera Pipeline Documentation")
+    canvas.drawString(margin, page_height - 25, "NYC Camera Pipeline Documentation")
     canvas.setFillColor(BLADE_RUNNER_ORANGE)
-    canvas.drawRightString(letter[0] - inch, letter[1] - 25, "Tyrell Corp Data Systems")
-    canvas.setFillColor(HexColor('#333333'))
+    canvas.drawRightString(page_width - margin, page_height - 25, "Tyrell Corp Data Systems")
+    canvas.setFillColor(TEXT_DARK)
     canvas.setFont('Helvetica', 8)
-    canvas.drawString(inch, 0.5 * inch, f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    canvas.drawRightString(letter[0] - inch, 0.5 * inch, f"Page {doc.page}")
+    if generated_at:
+        canvas.drawString(margin, 0.5 * margin, f"Generated: {generated_at}")
+    if page_numbers:
+        canvas.drawRightString(page_width - margin, 0.5 * margin, f"Page {doc.page}")
+    canvas.restoreState()
+
+def layout_cover(frame_width):
+    # Returns (font, size, color, centered, text, drop) per line, where drop is
+    # the distance below the previous baseline, plus the total height used.
+    lines = [
+        ('Helvetica-Bold', 28, BLADE_RUNNER_BLUE, True, COVER_TITLE, 1.5*inch + 28),
+        ('Helvetica-Oblique', 14, BLADE_RUNNER_ORANGE, True, COVER_SUBTITLE, 20 + 0.25*inch + 14),
+    ]
+    drop = 10 + 0.5*inch + 20
+    for text in OPENING_QUOTE_LINES:
+        lines.append(('Helvetica-Oblique', 10, TEXT_MUTED, True, text, drop))
+        drop = 12
+    drop = 10 + 0.5*inch + 10
+    for text in simpleSplit(COVER_DESCRIPTION, 'Helvetica', 10, frame_width - 12):
+        lines.append(('Helvetica', 10, black, False, text, drop))
+        drop = 14
+    return lines, sum(line[5] for line in lines) + 8 + 1*inch
+
+def add_cover_page(canvas, doc, generated_at, page_numbers=True):
+    add_header_footer(canvas, doc, generated_at, page_numbers)
+    canvas.saveState()
+    y = letter[1] - doc.topMargin - 6
+    for font, size, color, centered, text, drop in layout_cover(doc.width)[0]:
+        y -= drop
+        canvas.setFont(font, size)
+        canvas.setFillColor(color)
+        if centered:
+            canvas.drawCentredString(letter[0] / 2, y, text)
+        else:
+            canvas.drawString(doc.leftMargin + 6, y, text)
     canvas.restoreState()
 
+DEFAULT_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), BLADE_RUNNER_DARK),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('BACKGROUND', (0, 1), (-1, -1), BG_ALT),
+    ('TEXTCOLOR', (0, 1), (-1, -1), black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRID_GRAY),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('LEFTPADDING', (0, 0), (-1, -1), 6),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [BG_WHITE, BG_LIGHT]),
+])
+
+class DateAnchor(Flowable):
+    # Zero-size stand-in for the cover date in a template build; records where
+    # the date belongs so stamp_pdf can draw it there later.
+    def __init__(self):
+        Flowable.__init__(self)
+        self.position = None
+    
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+    
+    def draw(self):
+        self.position = self.canv.absolutePosition(0, 0)
+
+class UnsplittableTable(Table):
+    # Every table in this document fits on a page, so refuse to split and let
+    # the frame move the table whole instead of trial-splitting row by row.
+    def split(self, availWidth, availHeight):
+        return []
+
 def create_table(data, col_widths=None):
     if col_widths is None:
         col_widths = [1.5*inch] * len(data[0])
     
-    table = Table(data, colWidths=col_widths)
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), BLADE_RUNNER_DARK),
-        ('TEXTCOLOR', (0, 0), (-1, 0), white),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('BACKGROUND', (0, 1), (-1, -1), HexColor('#f9f9f9')),
-        ('TEXTCOLOR', (0, 1), (-1, -1), black),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-        ('GRID', (0, 0), (-1, -1), 0.5, HexColor('#cccccc')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('TOPPADDING', (0, 0), (-1, -1), 6),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [HexColor('#ffffff'), HexColor('#f5f5f5')]),
-    ]))
+    table = UnsplittableTable(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(DEFAULT_TABLE_STYLE)
     return table
 
-def build_pdf(output_path):
-    doc = SimpleDocTemplate(
-        output_path,
+TOC_ITEMS = (
+    "1. Architecture Overview",
+    "2. Features",
+    "3. Data Sources",
+    "4. System Components",
+    "5. Prerequisites",
+    "6. Quick Start Guide",
+    "7. Project Structure",
+    "8. Data Schema",
+    "9. Snowflake Tables",
+    "10. SQL Semantic Views",
+    "11. Dashboards and Notebooks",
+    "12. Example Queries",
+    "13. Environmental Data Integration",
+    "14. API Reference",
+    "15. Troubleshooting",
+)
+
+SYSTEM_COMPONENTS = (
+    "Data Acquisition Layer - 511NY API, NOAA Weather, EPA Air Quality",
+    "Processing Engine - Python Streaming Client with JWT/PAT Auth",
+    "Storage Layer - Snowflake Standard Tables, Iceberg Tables",
+    "Integration Layer - PostgreSQL Backup, Slack Notifications",
+    "Visualization Layer - Streamlit Dashboards, Snowflake Notebooks",
+    "AI Analysis - Cortex AI with Claude for image analysis",
+)
+
+STORAGE_ITEMS = (
+    "Snowflake Standard Table - Primary storage for real-time queries",
+    "Snowflake Iceberg Table - Open format for interoperability",
+    "PostgreSQL - Optional backup/redundancy",
+)
+
+AI_ITEMS = (
+    "claude-3-5-sonnet for multimodal image analysis",
+    "Traffic condition assessment",
+    "Weather/visibility detection",
+    "Vehicle counting",
+)
+
+CAMERA_QUERIES = (
+    "How many cameras are there?",
+    "What cameras are on I-495?",
+    "Which roadways have the most cameras?",
+)
+
+EVENT_QUERIES = (
+    "How many incidents today?",
+    "What construction is happening on I-95?",
+    "Show events by severity",
+)
+
+SPEED_QUERIES = (
+    "What is the average speed?",
+    "Where is traffic slowest?",
+    "Show congestion by roadway",
+)
+
+WEATHER_FIELDS = (
+    "Temperature (F/C)",
+    "Relative humidity",
+    "Wind speed and direction",
+    "Visibility",
+    "Barometric pressure",
+    "Weather conditions (Clear, Rain, Snow, etc.)",
+)
+
+AQ_FIELDS = (
+    "Air Quality Index (AQI) values",
+    "Pollutant types (PM2.5, PM10, Ozone)",
+    "Category classifications (Good, Moderate, Unhealthy)",
+    "Geographic reporting areas",
+)
+
+FEATURES_DATA = (
+    ('Feature', 'Description', 'Status'),
+    ('Real-time Streaming', 'Snowpipe Streaming v2 REST API (10GB/s)', 'Active'),
+    ('Iceberg Tables', 'Open table format for data lakehouse', 'Active'),
+    ('PostgreSQL Backup', 'Redundant metadata storage', 'Optional'),
+    ('Slack Alerts', 'Real-time image notifications', 'Optional'),
+    ('Cortex AI', 'Claude-powered image analysis', 'Ready'),
+    ('Streamlit Dashboard', 'Interactive web visualization', 'Active'),
+    ('Snowflake Notebooks', 'In-platform analytics (3 notebooks)', 'Active'),
+    ('SQL Semantic Views', 'Natural language queries', 'Active'),
+    ('Traffic Events', '511NY incidents and construction', 'Active'),
+    ('Traffic Speeds', 'Real-time congestion data', 'Active'),
+    ('Weather Integration', 'NOAA weather station data', 'Active'),
+    ('Air Quality', 'EPA AQI monitoring data', 'Active'),
+)
+
+PRIMARY_DATA = (
+    ('Source', 'Endpoint', 'Data Type', 'Refresh'),
+    ('Cameras', '/cameras', 'Live camera feeds', '60 sec'),
+    ('Traffic Events', '/events', 'Incidents, construction', '60 sec'),
+    ('Traffic Speeds', '/speeds', 'Segment speeds', '60 sec'),
+)
+
+ENV_DATA = (
+    ('Source', 'Table', 'Description'),
+    ('NOAA Weather', 'NOAAWEATHER', 'Weather observations from NOAA stations'),
+    ('EPA AirNow', 'AQ', 'Air Quality Index measurements'),
+    ('Weather Obs', 'WEATHER_OBSERVATIONS', 'Extended weather data'),
+)
+
+PREREQ_DATA = (
+    ('Requirement', 'Version', 'Notes'),
+    ('Python', '3.9+', 'Required'),
+    ('Snowflake Account', 'Enterprise+', 'Snowpipe Streaming enabled'),
+    ('511NY API Key', '-', 'Free at https://511ny.org/'),
+    ('PostgreSQL', '12+', 'Optional'),
+    ('Slack Bot Token', '-', 'Optional, xoxb-* format'),
+)
+
+STRUCTURE_DATA = (
+    ('Category', 'Files', 'Description'),
+    ('Core App', 'nyc_camera_main.py', 'Main entry point'),
+    ('Core App', 'nyc_camera_sensor.py', '511NY camera API client'),
+    ('Core App', 'nyc_traffic_events_sensor.py', '511NY events/speeds client'),
+    ('Core App', 'snowpipe_streaming_client.py', 'Snowpipe v2 REST client'),
+    ('Core App', 'snowflake_jwt_auth.py', 'Authentication module'),
+    ('Integrations', 'postgresql_client.py', 'PostgreSQL storage'),
+    ('Integrations', 'slack_notifier.py', 'Slack notifications'),
+    ('Visualization', 'streamlit_app.py', 'Camera dashboard'),
+    ('Visualization', 'traffic_dashboard.py', 'Full traffic dashboard'),
+    ('Notebooks', 'nyc_camera_analytics.ipynb', 'Camera analytics'),
+    ('Notebooks', 'nyc_traffic_analytics.ipynb', 'Traffic analytics'),
+    ('Notebooks', 'nyc_environmental_analysis.ipynb', 'Weather/AQ analysis'),
+    ('Config', 'semantic_views.sql', 'SQL semantic views'),
+    ('Setup', 'SETUP_SNOWFLAKE.sql', 'Snowflake DDL'),
+)
+
+CAMERA_SCHEMA = (
+    ('Column', 'Type', 'Description'),
+    ('uuid', 'STRING', 'Unique record ID'),
+    ('camera_id', 'STRING', '511NY camera ID'),
+    ('name', 'STRING', 'Camera location'),
+    ('latitude', 'FLOAT', 'GPS latitude'),
+    ('longitude', 'FLOAT', 'GPS longitude'),
+    ('direction_of_travel', 'STRING', 'Camera facing direction'),
+    ('roadway_name', 'STRING', 'Highway name'),
+    ('video_url', 'STRING', 'Live stream URL'),
+    ('image_url', 'STRING', 'Snapshot URL'),
+    ('disabled', 'BOOLEAN', 'Camera disabled flag'),
+    ('blocked', 'BOOLEAN', 'View blocked flag'),
+    ('image_timestamp', 'TIMESTAMP', 'Capture time'),
+    ('ingest_timestamp', 'TIMESTAMP', 'Ingestion time'),
+)
+
+EVENTS_SCHEMA = (
+    ('Column', 'Type', 'Description'),
+    ('uuid', 'STRING', 'Unique record ID'),
+    ('event_id', 'STRING', '511NY event ID'),
+    ('event_type', 'STRING', 'incident, construction, etc.'),
+    ('event_subtype', 'STRING', 'Event subcategory'),
+    ('severity', 'STRING', 'Event severity level'),
+    ('roadway_name', 'STRING', 'Affected roadway'),
+    ('direction', 'STRING', 'Affected direction'),
+    ('description', 'STRING', 'Event description'),
+    ('latitude', 'FLOAT', 'GPS latitude'),
+    ('longitude', 'FLOAT', 'GPS longitude'),
+    ('event_timestamp', 'TIMESTAMP', 'Event time'),
+)
+
+SPEEDS_SCHEMA = (
+    ('Column', 'Type', 'Description'),
+    ('uuid', 'STRING', 'Unique record ID'),
+    ('segment_id', 'STRING', 'Road segment ID'),
+    ('roadway_name', 'STRING', 'Roadway name'),
+    ('direction', 'STRING', 'Travel direction'),
+    ('from_location', 'STRING', 'Segment start'),
+    ('to_location', 'STRING', 'Segment end'),
+    ('current_speed', 'FLOAT', 'Current speed (mph)'),
+    ('free_flow_speed', 'FLOAT', 'Free flow speed (mph)'),
+    ('travel_time', 'FLOAT', 'Travel time (seconds)'),
+    ('traffic_timestamp', 'TIMESTAMP', 'Measurement time'),
+)
+
+TRAFFIC_TABLES = (
+    ('Table', 'Type', 'Description'),
+    ('NYC_CAMERA_DATA', 'Standard', 'Camera metadata and URLs'),
+    ('NYC_CAMERA_ICEBERG', 'Iceberg', 'Open format camera data'),
+    ('NYC_TRAFFIC_EVENTS', 'Standard', 'Incidents and construction'),
+    ('NYC_TRAFFIC_SPEEDS', 'Standard', 'Speed sensor data'),
+)
+
+ENV_TABLES = (
+    ('Table', 'Type', 'Description'),
+    ('NOAAWEATHER', 'Standard', 'NOAA weather observations'),
+    ('AQ', 'Iceberg', 'EPA Air Quality Index'),
+    ('WEATHER_OBSERVATIONS', 'Standard', 'Extended weather data'),
+)
+
+DASHBOARDS = (
+    ('Dashboard', 'File', 'Description'),
+    ('Camera Dashboard', 'streamlit_app.py', 'Camera locations, map, statistics'),
+    ('Traffic Dashboard', 'traffic_dashboard.py', 'Events, speeds, congestion analysis'),
+)
+
+NOTEBOOKS = (
+    ('Notebook', 'Description'),
+    ('nyc_camera_analytics.ipynb', 'Camera coverage and activity analysis'),
+    ('nyc_traffic_analytics.ipynb', 'Traffic events and speed correlation'),
+    ('nyc_environmental_analysis.ipynb', 'Weather x Air Quality x Traffic'),
+)
+
+API_DATA = (
+    ('Endpoint', 'Method', 'Description'),
+    ('/v1/streaming/channels', 'POST', 'Open channel'),
+    ('/v1/streaming/channels/{id}/append', 'POST', 'Append rows'),
+    ('/v1/streaming/channels/{id}', 'DELETE', 'Close channel'),
+)
+
+NY_API = (
+    ('Endpoint', 'Description'),
+    ('/api/getevents', 'Traffic events'),
+    ('/api/getcameras', 'Camera list'),
+    ('/api/getspeeds', 'Speed data'),
+)
+
+TROUBLESHOOT_DATA = (
+    ('Issue', 'Solution'),
+    ('401 Unauthorized', 'Check PAT token in config, regenerate if expired'),
+    ('STALE_CONTINUATION_TOKEN', 'Channel needs reopening, restart application'),
+    ('Connection refused PostgreSQL', 'Verify host/port, check pg_hba.conf'),
+    ('Empty camera data', 'Check 511NY API key validity'),
+    ('Slack upload fails', 'Verify bot has files:write scope'),
+    ('Semantic view errors', 'Run semantic_views.sql to recreate'),
+)
+
+BODY_TEXT = {
+    'arch_overview': (
+        "The NYC Camera Pipeline is a real-time data engineering system that streams traffic camera data, "
+        "traffic events, speed data, and environmental information to Snowflake using the Snowpipe Streaming "
+        "High Speed v2 REST API."
+    ),
+    'camera_sensor': (
+        "Connects to 511NY traffic camera API, fetches 2000+ camera feeds across NYC metropolitan area, "
+        "filters disabled/blocked cameras, and extracts location, direction, roadway, and URLs."
+    ),
+    'events_sensor': (
+        "Handles real-time traffic incidents and construction data, speed data from traffic sensors, "
+        "event severity classification, and geographic coverage mapping."
+    ),
+    'streaming_client': (
+        "Implements Snowpipe Streaming v2 REST API with JWT/PAT authentication via snowflake_jwt_auth.py, "
+        "channel management (open, append, close), and offset token tracking for exactly-once delivery."
+    ),
+    'configure_snowflake': (
+        "Create snowflake_config.json with user, account, pat, role, database, schema, table, "
+        "iceberg_table, pipe, and channel_name settings."
+    ),
+    'semantic_views': (
+        "Three SQL-based semantic views enable natural language querying via Cortex Analyst:"
+    ),
+    'correlation_analysis': (
+        "The nyc_environmental_analysis.ipynb notebook correlates weather impact on visibility and driving conditions, "
+        "air quality health advisories, and traffic patterns during weather events."
+    ),
+}
+
+COVER_TITLE = "NYC Street Camera Data Pipeline"
+COVER_SUBTITLE = "Blade Runner Surveillance System"
+COVER_DESCRIPTION = (
+    "Stream NYC traffic camera data to Snowflake via Snowpipe Streaming High Speed v2 REST API, "
+    "with optional PostgreSQL storage and Slack notifications. A real-time data engineering pipeline for the cyberpunk age."
+)
+OPENING_QUOTE_LINES = (
+    '"I\'ve seen things you people wouldn\'t believe...',
+    'Traffic cameras on fire off the shoulder of I-495..."',
+)
+CLOSING_QUOTE = (
+    '"All those moments will be lost in time, like tears in rain... '
+    'unless you stream them to Snowflake."'
+)
+
+@lru_cache(maxsize=None)
+def _parse_static_paragraph(text, style_name):
+    return Paragraph(text, create_styles()[style_name])
+
+def static_paragraph(text, style_name):
+    # Markup is parsed once per (text, style); each build gets a shallow copy
+    # so layout state never leaks between documents.
+    return copy.copy(_parse_static_paragraph(text, style_name))
+
+def static_list(items, template="- {}"):
+    # One paragraph with line breaks lays out far faster than a flowable per item.
+    return static_paragraph("<br/>".join(template.format(item) for item in items), 'CustomBodyText')
+
+def create_doc(target):
+    return SimpleDocTemplate(
+        target,
         pagesize=letter,
         rightMargin=0.75*inch,
         leftMargin=0.75*inch,
         topMargin=1*inch,
-        bottomMargin=0.75*inch
+        bottomMargin=0.75*inch,
+        pageCompression=1,
+        invariant=1
     )
-    
+
+def build_story(generated, date_anchor=None):
     styles = create_styles()
     story = []
     
-    story.append(Spacer(1, 1.5*inch))
-    story.append(Paragraph("NYC Street Camera Data Pipeline", styles['CoverTitle']))
-    story.append(Spacer(1, 0.25*inch))
-    story.append(Paragraph("Blade Runner Surveillance System", styles['CoverSubtitle']))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(
-        '"I\'ve seen things you people wouldn\'t believe...<br/>Traffic cameras on fire off the shoulder of I-495..."',
-        styles['Quote']
-    ))
-    story.append(Spacer(1, 0.5*inch))
-    story.append(Paragraph(
-        "Stream NYC traffic camera data to Snowflake via Snowpipe Streaming High Speed v2 REST API, "
-        "with optional PostgreSQL storage and Slack notifications. A real-time data engineering pipeline for the cyberpunk age.",
-        styles['CustomBodyText']
-    ))
-    story.append(Spacer(1, 1*inch))
+    # The cover text is drawn straight onto the canvas by add_cover_page;
+    # reserve its height so the cover table lands where it always has.
+    story.append(Spacer(1, layout_cover(letter[0] - 1.5*inch)[1]))
     
     cover_table_data = [
         ['Document', 'NYC Camera Pipeline Technical Documentation'],
         ['Version', '2.0'],
-        ['Date', datetime.now().strftime('%B %d, %Y')],
+        ['Date', date_anchor or generated.strftime('%B %d, %Y')],
         ['Author', 'Tyrell Corporation Data Systems'],
         ['Classification', 'REPLICANT APPROVED']
     ]
@@ -191,352 +548,160 @@ def build_pdf(output_path):
     story.append(PageBreak())
     
     story.append(Paragraph("Table of Contents", styles['SectionHeader']))
-    toc_items = [
-        "1. Architecture Overview",
-        "2. Features",
-        "3. Data Sources",
-        "4. System Components",
-        "5. Prerequisites",
-        "6. Quick Start Guide",
-        "7. Project Structure",
-        "8. Data Schema",
-        "9. Snowflake Tables",
-        "10. SQL Semantic Views",
-        "11. Dashboards and Notebooks",
-        "12. Example Queries",
-        "13. Environmental Data Integration",
-        "14. API Reference",
-        "15. Troubleshooting"
-    ]
-    for item in toc_items:
-        story.append(Paragraph(item, styles['CustomBodyText']))
+    story.append(static_list(TOC_ITEMS, "{}"))
     story.append(PageBreak())
     
     story.append(Paragraph("1. Architecture Overview", styles['SectionHeader']))
-    story.append(Paragraph(
-        "The NYC Camera Pipeline is a real-time data engineering system that streams traffic camera data, "
-        "traffic events, speed data, and environmental information to Snowflake using the Snowpipe Streaming "
-        "High Speed v2 REST API.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['arch_overview'], 'CustomBodyText'))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("System Components:", styles['SubsectionHeader']))
-    components = [
-        "Data Acquisition Layer - 511NY API, NOAA Weather, EPA Air Quality",
-        "Processing Engine - Python Streaming Client with JWT/PAT Auth",
-        "Storage Layer - Snowflake Standard Tables, Iceberg Tables",
-        "Integration Layer - PostgreSQL Backup, Slack Notifications",
-        "Visualization Layer - Streamlit Dashboards, Snowflake Notebooks",
-        "AI Analysis - Cortex AI with Claude for image analysis"
-    ]
-    for comp in components:
-        story.append(Paragraph(f"- {comp}", styles['CustomBodyText']))
+    story.append(static_list(SYSTEM_COMPONENTS))
     story.append(PageBreak())
     
     story.append(Paragraph("2. Features", styles['SectionHeader']))
-    features_data = [
-        ['Feature', 'Description', 'Status'],
-        ['Real-time Streaming', 'Snowpipe Streaming v2 REST API (10GB/s)', 'Active'],
-        ['Iceberg Tables', 'Open table format for data lakehouse', 'Active'],
-        ['PostgreSQL Backup', 'Redundant metadata storage', 'Optional'],
-        ['Slack Alerts', 'Real-time image notifications', 'Optional'],
-        ['Cortex AI', 'Claude-powered image analysis', 'Ready'],
-        ['Streamlit Dashboard', 'Interactive web visualization', 'Active'],
-        ['Snowflake Notebooks', 'In-platform analytics (3 notebooks)', 'Active'],
-        ['SQL Semantic Views', 'Natural language queries', 'Active'],
-        ['Traffic Events', '511NY incidents and construction', 'Active'],
-        ['Traffic Speeds', 'Real-time congestion data', 'Active'],
-        ['Weather Integration', 'NOAA weather station data', 'Active'],
-        ['Air Quality', 'EPA AQI monitoring data', 'Active']
-    ]
-    story.append(create_table(features_data, [1.5*inch, 3.5*inch, 0.8*inch]))
+    story.append(create_table(FEATURES_DATA, [1.5*inch, 3.5*inch, 0.8*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("3. Data Sources", styles['SectionHeader']))
     story.append(Paragraph("Primary Sources (511NY API)", styles['SubsectionHeader']))
-    primary_data = [
-        ['Source', 'Endpoint', 'Data Type', 'Refresh'],
-        ['Cameras', '/cameras', 'Live camera feeds', '60 sec'],
-        ['Traffic Events', '/events', 'Incidents, construction', '60 sec'],
-        ['Traffic Speeds', '/speeds', 'Segment speeds', '60 sec']
-    ]
-    story.append(create_table(primary_data, [1.2*inch, 1.5*inch, 2*inch, 1*inch]))
+    story.append(create_table(PRIMARY_DATA, [1.2*inch, 1.5*inch, 2*inch, 1*inch]))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("Environmental Sources", styles['SubsectionHeader']))
-    env_data = [
-        ['Source', 'Table', 'Description'],
-        ['NOAA Weather', 'NOAAWEATHER', 'Weather observations from NOAA stations'],
-        ['EPA AirNow', 'AQ', 'Air Quality Index measurements'],
-        ['Weather Obs', 'WEATHER_OBSERVATIONS', 'Extended weather data']
-    ]
-    story.append(create_table(env_data, [1.5*inch, 2*inch, 2.5*inch]))
+    story.append(create_table(ENV_DATA, [1.5*inch, 2*inch, 2.5*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("4. System Components", styles['SectionHeader']))
     
     story.append(Paragraph("Data Acquisition (nyc_camera_sensor.py)", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "Connects to 511NY traffic camera API, fetches 2000+ camera feeds across NYC metropolitan area, "
-        "filters disabled/blocked cameras, and extracts location, direction, roadway, and URLs.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['camera_sensor'], 'CustomBodyText'))
     
     story.append(Paragraph("Traffic Events (nyc_traffic_events_sensor.py)", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "Handles real-time traffic incidents and construction data, speed data from traffic sensors, "
-        "event severity classification, and geographic coverage mapping.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['events_sensor'], 'CustomBodyText'))
     
     story.append(Paragraph("Streaming Client (snowpipe_streaming_client.py)", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "Implements Snowpipe Streaming v2 REST API with JWT/PAT authentication via snowflake_jwt_auth.py, "
-        "channel management (open, append, close), and offset token tracking for exactly-once delivery.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['streaming_client'], 'CustomBodyText'))
     
     story.append(Paragraph("Storage Layer", styles['SubsectionHeader']))
-    storage_items = [
-        "Snowflake Standard Table - Primary storage for real-time queries",
-        "Snowflake Iceberg Table - Open format for interoperability",
-        "PostgreSQL - Optional backup/redundancy"
-    ]
-    for item in storage_items:
-        story.append(Paragraph(f"- {item}", styles['CustomBodyText']))
+    story.append(static_list(STORAGE_ITEMS))
     
     story.append(Paragraph("AI Analysis (Cortex)", styles['SubsectionHeader']))
-    ai_items = [
-        "claude-3-5-sonnet for multimodal image analysis",
-        "Traffic condition assessment",
-        "Weather/visibility detection",
-        "Vehicle counting"
-    ]
-    for item in ai_items:
-        story.append(Paragraph(f"- {item}", styles['CustomBodyText']))
+    story.append(static_list(AI_ITEMS))
     story.append(PageBreak())
     
     story.append(Paragraph("5. Prerequisites", styles['SectionHeader']))
-    prereq_data = [
-        ['Requirement', 'Version', 'Notes'],
-        ['Python', '3.9+', 'Required'],
-        ['Snowflake Account', 'Enterprise+', 'Snowpipe Streaming enabled'],
-        ['511NY API Key', '-', 'Free at https://511ny.org/'],
-        ['PostgreSQL', '12+', 'Optional'],
-        ['Slack Bot Token', '-', 'Optional, xoxb-* format']
-    ]
-    story.append(create_table(prereq_data, [1.8*inch, 1.2*inch, 2.5*inch]))
+    story.append(create_table(PREREQ_DATA, [1.8*inch, 1.2*inch, 2.5*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("6. Quick Start Guide", styles['SectionHeader']))
     
     story.append(Paragraph("Step 1: Clone and Install", styles['SubsectionHeader']))
-    story.append(Paragraph("git clone https://github.com/tspannhw/nyccamera.git", styles['CodeBlock']))
-    story.append(Paragraph("cd nyccamera", styles['CodeBlock']))
-    story.append(Paragraph("pip install -r requirements.txt", styles['CodeBlock']))
+    story.append(XPreformatted(
+        "git clone https://github.com/tspannhw/nyccamera.git\n"
+        "cd nyccamera\n"
+        "pip install -r requirements.txt",
+        styles['CodeBlock']
+    ))
     
     story.append(Paragraph("Step 2: Configure Snowflake", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "Create snowflake_config.json with user, account, pat, role, database, schema, table, "
-        "iceberg_table, pipe, and channel_name settings.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['configure_snowflake'], 'CustomBodyText'))
     
     story.append(Paragraph("Step 3: Initialize Database", styles['SubsectionHeader']))
-    story.append(Paragraph("python setup_tables.py --snowflake-only", styles['CodeBlock']))
+    story.append(XPreformatted("python setup_tables.py --snowflake-only", styles['CodeBlock']))
     
     story.append(Paragraph("Step 4: Run the Pipeline", styles['SubsectionHeader']))
-    story.append(Paragraph("export NYC_API_KEY='your_511ny_api_key'", styles['CodeBlock']))
-    story.append(Paragraph("./run_nyc_camera.sh", styles['CodeBlock']))
+    story.append(XPreformatted(
+        "export NYC_API_KEY='your_511ny_api_key'\n"
+        "./run_nyc_camera.sh",
+        styles['CodeBlock']
+    ))
     story.append(PageBreak())
     
     story.append(Paragraph("7. Project Structure", styles['SectionHeader']))
-    structure_data = [
-        ['Category', 'Files', 'Description'],
-        ['Core App', 'nyc_camera_main.py', 'Main entry point'],
-        ['Core App', 'nyc_camera_sensor.py', '511NY camera API client'],
-        ['Core App', 'nyc_traffic_events_sensor.py', '511NY events/speeds client'],
-        ['Core App', 'snowpipe_streaming_client.py', 'Snowpipe v2 REST client'],
-        ['Core App', 'snowflake_jwt_auth.py', 'Authentication module'],
-        ['Integrations', 'postgresql_client.py', 'PostgreSQL storage'],
-        ['Integrations', 'slack_notifier.py', 'Slack notifications'],
-        ['Visualization', 'streamlit_app.py', 'Camera dashboard'],
-        ['Visualization', 'traffic_dashboard.py', 'Full traffic dashboard'],
-        ['Notebooks', 'nyc_camera_analytics.ipynb', 'Camera analytics'],
-        ['Notebooks', 'nyc_traffic_analytics.ipynb', 'Traffic analytics'],
-        ['Notebooks', 'nyc_environmental_analysis.ipynb', 'Weather/AQ analysis'],
-        ['Config', 'semantic_views.sql', 'SQL semantic views'],
-        ['Setup', 'SETUP_SNOWFLAKE.sql', 'Snowflake DDL']
-    ]
-    story.append(create_table(structure_data, [1.3*inch, 2.5*inch, 2*inch]))
+    story.append(create_table(STRUCTURE_DATA, [1.3*inch, 2.5*inch, 2*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("8. Data Schema", styles['SectionHeader']))
     
     story.append(Paragraph("NYC_CAMERA_DATA Table", styles['SubsectionHeader']))
-    camera_schema = [
-        ['Column', 'Type', 'Description'],
-        ['uuid', 'STRING', 'Unique record ID'],
-        ['camera_id', 'STRING', '511NY camera ID'],
-        ['name', 'STRING', 'Camera location'],
-        ['latitude', 'FLOAT', 'GPS latitude'],
-        ['longitude', 'FLOAT', 'GPS longitude'],
-        ['direction_of_travel', 'STRING', 'Camera facing direction'],
-        ['roadway_name', 'STRING', 'Highway name'],
-        ['video_url', 'STRING', 'Live stream URL'],
-        ['image_url', 'STRING', 'Snapshot URL'],
-        ['disabled', 'BOOLEAN', 'Camera disabled flag'],
-        ['blocked', 'BOOLEAN', 'View blocked flag'],
-        ['image_timestamp', 'TIMESTAMP', 'Capture time'],
-        ['ingest_timestamp', 'TIMESTAMP', 'Ingestion time']
-    ]
-    story.append(create_table(camera_schema, [1.8*inch, 1.2*inch, 2.8*inch]))
+    story.append(create_table(CAMERA_SCHEMA, [1.8*inch, 1.2*inch, 2.8*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("NYC_TRAFFIC_EVENTS Table", styles['SubsectionHeader']))
-    events_schema = [
-        ['Column', 'Type', 'Description'],
-        ['uuid', 'STRING', 'Unique record ID'],
-        ['event_id', 'STRING', '511NY event ID'],
-        ['event_type', 'STRING', 'incident, construction, etc.'],
-        ['event_subtype', 'STRING', 'Event subcategory'],
-        ['severity', 'STRING', 'Event severity level'],
-        ['roadway_name', 'STRING', 'Affected roadway'],
-        ['direction', 'STRING', 'Affected direction'],
-        ['description', 'STRING', 'Event description'],
-        ['latitude', 'FLOAT', 'GPS latitude'],
-        ['longitude', 'FLOAT', 'GPS longitude'],
-        ['event_timestamp', 'TIMESTAMP', 'Event time']
-    ]
-    story.append(create_table(events_schema, [1.8*inch, 1.2*inch, 2.8*inch]))
+    story.append(create_table(EVENTS_SCHEMA, [1.8*inch, 1.2*inch, 2.8*inch]))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("NYC_TRAFFIC_SPEEDS Table", styles['SubsectionHeader']))
-    speeds_schema = [
-        ['Column', 'Type', 'Description'],
-        ['uuid', 'STRING', 'Unique record ID'],
-        ['segment_id', 'STRING', 'Road segment ID'],
-        ['roadway_name', 'STRING', 'Roadway name'],
-        ['direction', 'STRING', 'Travel direction'],
-        ['from_location', 'STRING', 'Segment start'],
-        ['to_location', 'STRING', 'Segment end'],
-        ['current_speed', 'FLOAT', 'Current speed (mph)'],
-        ['free_flow_speed', 'FLOAT', 'Free flow speed (mph)'],
-        ['travel_time', 'FLOAT', 'Travel time (seconds)'],
-        ['traffic_timestamp', 'TIMESTAMP', 'Measurement time']
-    ]
-    story.append(create_table(speeds_schema, [1.8*inch, 1.2*inch, 2.8*inch]))
+    story.append(create_table(SPEEDS_SCHEMA, [1.8*inch, 1.2*inch, 2.8*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("9. Snowflake Tables", styles['SectionHeader']))
     
     story.append(Paragraph("Traffic Tables", styles['SubsectionHeader']))
-    traffic_tables = [
-        ['Table', 'Type', 'Description'],
-        ['NYC_CAMERA_DATA', 'Standard', 'Camera metadata and URLs'],
-        ['NYC_CAMERA_ICEBERG', 'Iceberg', 'Open format camera data'],
-        ['NYC_TRAFFIC_EVENTS', 'Standard', 'Incidents and construction'],
-        ['NYC_TRAFFIC_SPEEDS', 'Standard', 'Speed sensor data']
-    ]
-    story.append(create_table(traffic_tables, [2*inch, 1.2*inch, 2.5*inch]))
+    story.append(create_table(TRAFFIC_TABLES, [2*inch, 1.2*inch, 2.5*inch]))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("Environmental Tables", styles['SubsectionHeader']))
-    env_tables = [
-        ['Table', 'Type', 'Description'],
-        ['NOAAWEATHER', 'Standard', 'NOAA weather observations'],
-        ['AQ', 'Iceberg', 'EPA Air Quality Index'],
-        ['WEATHER_OBSERVATIONS', 'Standard', 'Extended weather data']
-    ]
-    story.append(create_table(env_tables, [2*inch, 1.2*inch, 2.5*inch]))
+    story.append(create_table(ENV_TABLES, [2*inch, 1.2*inch, 2.5*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("10. SQL Semantic Views", styles['SectionHeader']))
-    story.append(Paragraph(
-        "Three SQL-based semantic views enable natural language querying via Cortex Analyst:",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['semantic_views'], 'CustomBodyText'))
     story.append(Spacer(1, 0.15*inch))
     
     story.append(Paragraph("NYC_CAMERA_SEMANTIC_VIEW", styles['SubsectionHeader']))
-    camera_queries = [
-        "How many cameras are there?",
-        "What cameras are on I-495?",
-        "Which roadways have the most cameras?"
-    ]
-    for q in camera_queries:
-        story.append(Paragraph(f'- "{q}"', styles['CustomBodyText']))
+    story.append(static_list(CAMERA_QUERIES, '- "{}"'))
     
     story.append(Paragraph("NYC_TRAFFIC_EVENTS_SEMANTIC_VIEW", styles['SubsectionHeader']))
-    event_queries = [
-        "How many incidents today?",
-        "What construction is happening on I-95?",
-        "Show events by severity"
-    ]
-    for q in event_queries:
-        story.append(Paragraph(f'- "{q}"', styles['CustomBodyText']))
+    story.append(static_list(EVENT_QUERIES, '- "{}"'))
     
     story.append(Paragraph("NYC_TRAFFIC_SPEEDS_SEMANTIC_VIEW", styles['SubsectionHeader']))
-    speed_queries = [
-        "What is the average speed?",
-        "Where is traffic slowest?",
-        "Show congestion by roadway"
-    ]
-    for q in speed_queries:
-        story.append(Paragraph(f'- "{q}"', styles['CustomBodyText']))
+    story.append(static_list(SPEED_QUERIES, '- "{}"'))
     story.append(PageBreak())
     
     story.append(Paragraph("11. Dashboards and Notebooks", styles['SectionHeader']))
     
     story.append(Paragraph("Streamlit Dashboards", styles['SubsectionHeader']))
-    dashboards = [
-        ['Dashboard', 'File', 'Description'],
-        ['Camera Dashboard', 'streamlit_app.py', 'Camera locations, map, statistics'],
-        ['Traffic Dashboard', 'traffic_dashboard.py', 'Events, speeds, congestion analysis']
-    ]
-    story.append(create_table(dashboards, [1.5*inch, 2*inch, 2.3*inch]))
+    story.append(create_table(DASHBOARDS, [1.5*inch, 2*inch, 2.3*inch]))
     story.append(Spacer(1, 0.15*inch))
-    story.append(Paragraph(
+    story.append(XPreformatted(
         "Launch: SNOWFLAKE_CONNECTION_NAME=default streamlit run traffic_dashboard.py --server.port 8501",
         styles['CodeBlock']
     ))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("Snowflake Notebooks", styles['SubsectionHeader']))
-    notebooks = [
-        ['Notebook', 'Description'],
-        ['nyc_camera_analytics.ipynb', 'Camera coverage and activity analysis'],
-        ['nyc_traffic_analytics.ipynb', 'Traffic events and speed correlation'],
-        ['nyc_environmental_analysis.ipynb', 'Weather x Air Quality x Traffic']
-    ]
-    story.append(create_table(notebooks, [2.5*inch, 3.3*inch]))
+    story.append(create_table(NOTEBOOKS, [2.5*inch, 3.3*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("12. Example Queries", styles['SectionHeader']))
     
     story.append(Paragraph("Recent Camera Activity", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "SELECT camera_id, name, roadway_name, image_timestamp FROM DEMO.DEMO.NYC_CAMERA_DATA "
-        "WHERE image_timestamp >= DATEADD('hour', -1, CURRENT_TIMESTAMP()) "
-        "QUALIFY ROW_NUMBER() OVER (PARTITION BY camera_id ORDER BY image_timestamp DESC) = 1 "
+    story.append(XPreformatted(
+        "SELECT camera_id, name, roadway_name, image_timestamp\n"
+        "FROM DEMO.DEMO.NYC_CAMERA_DATA\n"
+        "WHERE image_timestamp >= DATEADD('hour', -1, CURRENT_TIMESTAMP())\n"
+        "QUALIFY ROW_NUMBER() OVER (PARTITION BY camera_id ORDER BY image_timestamp DESC) = 1\n"
         "ORDER BY image_timestamp DESC LIMIT 20;",
         styles['CodeBlock']
     ))
     
     story.append(Paragraph("Traffic Congestion Hotspots", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "SELECT roadway_name, ROUND(AVG(current_speed), 1) as avg_speed, "
-        "ROUND(AVG(current_speed / NULLIF(free_flow_speed, 0)) * 100, 1) as flow_pct "
-        "FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS WHERE traffic_timestamp >= DATEADD('hour', -6, CURRENT_TIMESTAMP()) "
+    story.append(XPreformatted(
+        "SELECT roadway_name, ROUND(AVG(current_speed), 1) as avg_speed,\n"
+        "       ROUND(AVG(current_speed / NULLIF(free_flow_speed, 0)) * 100, 1) as flow_pct\n"
+        "FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS\n"
+        "WHERE traffic_timestamp >= DATEADD('hour', -6, CURRENT_TIMESTAMP())\n"
         "GROUP BY roadway_name ORDER BY flow_pct ASC LIMIT 20;",
         styles['CodeBlock']
     ))
     
     story.append(Paragraph("Air Quality by Region", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "SELECT reportingarea, parametername, ROUND(AVG(aqi), 1) as avg_aqi, "
-        "MODE(categoryname) as typical_category FROM DEMO.DEMO.AQ "
+    story.append(XPreformatted(
+        "SELECT reportingarea, parametername, ROUND(AVG(aqi), 1) as avg_aqi,\n"
+        "       MODE(categoryname) as typical_category\n"
+        "FROM DEMO.DEMO.AQ\n"
         "GROUP BY reportingarea, parametername ORDER BY avg_aqi DESC;",
         styles['CodeBlock']
     ))
@@ -545,82 +710,185 @@ def build_pdf(output_path):
     story.append(Paragraph("13. Environmental Data Integration", styles['SectionHeader']))
     
     story.append(Paragraph("Weather Data (NOAA)", styles['SubsectionHeader']))
-    weather_fields = [
-        "Temperature (F/C)",
-        "Relative humidity",
-        "Wind speed and direction",
-        "Visibility",
-        "Barometric pressure",
-        "Weather conditions (Clear, Rain, Snow, etc.)"
-    ]
-    for field in weather_fields:
-        story.append(Paragraph(f"- {field}", styles['CustomBodyText']))
+    story.append(static_list(WEATHER_FIELDS))
     
     story.append(Paragraph("Air Quality Data (EPA)", styles['SubsectionHeader']))
-    aq_fields = [
-        "Air Quality Index (AQI) values",
-        "Pollutant types (PM2.5, PM10, Ozone)",
-        "Category classifications (Good, Moderate, Unhealthy)",
-        "Geographic reporting areas"
-    ]
-    for field in aq_fields:
-        story.append(Paragraph(f"- {field}", styles['CustomBodyText']))
+    story.append(static_list(AQ_FIELDS))
     
     story.append(Paragraph("Correlation Analysis", styles['SubsectionHeader']))
-    story.append(Paragraph(
-        "The nyc_environmental_analysis.ipynb notebook correlates weather impact on visibility and driving conditions, "
-        "air quality health advisories, and traffic patterns during weather events.",
-        styles['CustomBodyText']
-    ))
+    story.append(static_paragraph(BODY_TEXT['correlation_analysis'], 'CustomBodyText'))
     story.append(PageBreak())
     
     story.append(Paragraph("14. API Reference", styles['SectionHeader']))
     
     story.append(Paragraph("Snowpipe Streaming v2 REST API", styles['SubsectionHeader']))
-    api_data = [
-        ['Endpoint', 'Method', 'Description'],
-        ['/v1/streaming/channels', 'POST', 'Open channel'],
-        ['/v1/streaming/channels/{id}/append', 'POST', 'Append rows'],
-        ['/v1/streaming/channels/{id}', 'DELETE', 'Close channel']
-    ]
-    story.append(create_table(api_data, [2.5*inch, 1*inch, 2.3*inch]))
+    story.append(create_table(API_DATA, [2.5*inch, 1*inch, 2.3*inch]))
     story.append(Spacer(1, 0.25*inch))
     
     story.append(Paragraph("511NY API", styles['SubsectionHeader']))
-    ny_api = [
-        ['Endpoint', 'Description'],
-        ['/api/getevents', 'Traffic events'],
-        ['/api/getcameras', 'Camera list'],
-        ['/api/getspeeds', 'Speed data']
-    ]
-    story.append(create_table(ny_api, [2.5*inch, 3.3*inch]))
+    story.append(create_table(NY_API, [2.5*inch, 3.3*inch]))
     story.append(PageBreak())
     
     story.append(Paragraph("15. Troubleshooting", styles['SectionHeader']))
-    troubleshoot_data = [
-        ['Issue', 'Solution'],
-        ['401 Unauthorized', 'Check PAT token in config, regenerate if expired'],
-        ['STALE_CONTINUATION_TOKEN', 'Channel needs reopening, restart application'],
-        ['Connection refused PostgreSQL', 'Verify host/port, check pg_hba.conf'],
-        ['Empty camera data', 'Check 511NY API key validity'],
-        ['Slack upload fails', 'Verify bot has files:write scope'],
-        ['Semantic view errors', 'Run semantic_views.sql to recreate']
-    ]
-    story.append(create_table(troubleshoot_data, [2.3*inch, 3.5*inch]))
+    story.append(create_table(TROUBLESHOOT_DATA, [2.3*inch, 3.5*inch]))
     story.append(PageBreak())
     
     story.append(Spacer(1, 2*inch))
-    story.append(Paragraph(
-        '"All those moments will be lost in time, like tears in rain... unless you stream them to Snowflake."',
-        styles['Quote']
-    ))
+    story.append(static_paragraph(CLOSING_QUOTE, 'Quote'))
     story.append(Spacer(1, 0.5*inch))
     story.append(Paragraph("Built with Snowflake + Python + Cortex AI", styles['CoverSubtitle']))
     story.append(Paragraph("Tyrell Corporation Data Systems - More Human Than Human", styles['CoverSubtitle']))
     
-    doc.build(story, onFirstPage=add_header_footer, onLaterPages=add_header_footer)
-    print(f"PDF generated: {output_path}")
+    return story
+
+def split_sections(story):
+    # Every PageBreak starts a fresh page, so the flowables between two breaks
+    # can be laid out as an independent document without changing the output.
+    sections = [[]]
+    for flowable in story:
+        if isinstance(flowable, PageBreak):
+            sections.append([])
+        else:
+            sections[-1].append(flowable)
+    return [section for section in sections if section]
+
+def render_section(index, generated):
+    section = split_sections(build_story(generated))[index]
+    buf = io.BytesIO()
+    generated_at = generated.strftime('%Y-%m-%d %H:%M')
+    footer = partial(add_header_footer, generated_at=generated_at, page_numbers=False)
+    first_page = partial(add_cover_page, generated_at=generated_at, page_numbers=False) if index == 0 else footer
+    create_doc(buf).build(section, onFirstPage=first_page, onLaterPages=footer)
+    return buf.getvalue()
+
+def page_number_overlay(page_count):
+    buf = io.BytesIO()
+    overlay = canvas.Canvas(buf, pagesize=letter)
+    for page in range(1, page_count + 1):
+        overlay.setFillColor(TEXT_DARK)
+        overlay.setFont('Helvetica', 8)
+        overlay.drawRightString(letter[0] - inch, 0.5 * inch, f"Page {page}")
+        overlay.showPage()
+    overlay.save()
+    buf.seek(0)
+    return buf
+
+def build_pdf(output_path, workers=1):
+    # Captured once so every page (and every worker) stamps the same time.
+    generated = datetime.now()
+    story = build_story(generated)
+    section_count = len(split_sections(story))
+    # Serial by default: each worker rebuilds the whole story and pool startup
+    # outweighs the layout work for a document of this size (0.22s with 4
+    # workers vs 0.06s serial on 19 pages), so parallelism is opt-in.
+    workers = min(max(workers, 1), section_count)
+    
+    if PdfWriter is None or workers <= 1:
+        buf = io.BytesIO()
+        generated_at = generated.strftime('%Y-%m-%d %H:%M')
+        create_doc(buf).build(
+            story,
+            onFirstPage=partial(add_cover_page, generated_at=generated_at),
+            onLaterPages=partial(add_header_footer, generated_at=generated_at)
+        )
+        with open(output_path, 'wb') as f:
+            f.write(buf.getbuffer())
+        print(f"PDF generated: {output_path}")
+        return
+    
+    # ReportLab layout is single-threaded, so sections are laid out in separate
+    # processes and stitched together; page numbers are stamped afterwards
+    # because a section cannot know how many pages precede it.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        rendered = list(executor.map(render_section, range(section_count), [generated] * section_count))
+    
+    writer = PdfWriter()
+    for section_pdf in rendered:
+        writer.append(PdfReader(io.BytesIO(section_pdf)))
+    overlay = PdfReader(page_number_overlay(len(writer.pages)))
+    for page, stamp in zip(writer.pages, overlay.pages):
+        page.merge_page(stamp)
+        page.compress_content_streams()
+    buf = io.BytesIO()
+    writer.write(buf)
+    with open(output_path, 'wb') as f:
+        f.write(buf.getbuffer())
+    print(f"PDF generated: {output_path} ({section_count} sections, {workers} workers)")
+
+def build_template(template_path=TEMPLATE_PATH):
+    # Everything except the build date is constant, so lay the document out
+    # once with the date left blank and record where the cover date goes.
+    anchor = DateAnchor()
+    buf = io.BytesIO()
+    create_doc(buf).build(
+        build_story(None, date_anchor=anchor),
+        onFirstPage=partial(add_cover_page, generated_at=None),
+        onLaterPages=partial(add_header_footer, generated_at=None)
+    )
+    writer = PdfWriter(clone_from=PdfReader(buf))
+    writer.add_metadata({'/DateAnchor': f"{anchor.position[0]:.2f} {anchor.position[1]:.2f}"})
+    with open(template_path, 'wb') as f:
+        writer.write(f)
+    print(f"Template generated: {template_path}")
+
+def timestamp_overlay(generated, date_anchor):
+    # Page 1 of the overlay is for the cover (footer + cover date), page 2 is
+    # the footer shared by every other page.
+    buf = io.BytesIO()
+    overlay = canvas.Canvas(buf, pagesize=letter)
+    for cover in (True, False):
+        overlay.setFillColor(TEXT_DARK)
+        overlay.setFont('Helvetica', 8)
+        overlay.drawString(inch, 0.5 * inch, f"Generated: {generated.strftime('%Y-%m-%d %H:%M')}")
+        if cover:
+            overlay.setFillColor(black)
+            overlay.drawString(date_anchor[0], date_anchor[1] - 2, generated.strftime('%B %d, %Y'))
+        overlay.showPage()
+    overlay.save()
+    buf.seek(0)
+    return PdfReader(buf).pages
+
+def template_is_stale(template_path=TEMPLATE_PATH):
+    # The document content lives in this script, so any edit to it since the
+    # template was rendered means the template no longer matches.
+    return (not os.path.exists(template_path)
+            or os.path.getmtime(template_path) < os.path.getmtime(os.path.abspath(__file__)))
+
+def stamp_pdf(output_path, template_path=TEMPLATE_PATH):
+    if PdfWriter is None:
+        build_pdf(output_path)
+        return
+    if template_is_stale(template_path):
+        build_template(template_path)
+    
+    writer = PdfWriter(clone_from=PdfReader(template_path))
+    date_anchor = [float(v) for v in writer.metadata['/DateAnchor'].split()]
+    cover_stamp, footer_stamp = timestamp_overlay(datetime.now(), date_anchor)
+    for index, page in enumerate(writer.pages):
+        page.merge_page(cover_stamp if index == 0 else footer_stamp)
+        page.compress_content_streams()
+    buf = io.BytesIO()
+    writer.write(buf)
+    with open(output_path, 'wb') as f:
+        f.write(buf.getbuffer())
+    print(f"PDF generated: {output_path} (from template)")
 
 if __name__ == "__main__":
-    output_file = "/Users/tspann/Downloads/code/coco/nyccamera/NYC_Camera_Pipeline_Documentation.pdf"
-    build_pdf(output_file)
+    parser = argparse.ArgumentParser(description='Generate the NYC Camera Pipeline documentation PDF')
+    parser.add_argument('--output',
+                       default="/Users/tspann/Downloads/code/coco/nyccamera/NYC_Camera_Pipeline_Documentation.pdf",
+                       help='Output PDF path')
+    parser.add_argument('--build-template', action='store_true',
+                       help='Pre-render the static template instead of a dated PDF')
+    parser.add_argument('--from-template', action='store_true',
+                       help='Stamp the date onto the pre-rendered template (rebuilt first if the script is newer)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes for section layout on a full build (default: 1, serial)')
+    args = parser.parse_args()
+    
+    if args.build_template:
+        build_template()
+    elif args.from_template:
+        stamp_pdf(args.output)
+    else:
+        build_pdf(args.output, workers=args.workers)
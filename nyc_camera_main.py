@@ -14,15 +14,20 @@ Based on: https://github.com/tspannhw/SNACKAI-CoCo-ADSB
 import os
 import sys
 import json
+import queue
+import random
 import signal
+import threading
 import logging
 import argparse
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Optional
 
 from nyc_camera_sensor import NYCCameraSensor
-from snowpipe_streaming_client import SnowpipeStreamingClient
+from snowpipe_streaming_client import PartialAppendError, SnowpipeStreamingClient
 from slack_notifier import SlackNotifier
 from postgresql_client import PostgreSQLClient
 
@@ -32,13 +37,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-shutdown_requested = False
+# Set by the signal handler; also wakes the loop out of its interval wait
+shutdown_event = threading.Event()
+
+# Consecutive Snowpipe append failures tolerated before the pipeline gives up
+MAX_APPEND_FAILURES = 5
+
+# Cameras tried per batch when looking for online images to send to Slack
+IMAGE_CANDIDATES = 10
+
+# Online camera images sent to Slack per batch
+IMAGES_PER_BATCH = 3
+
+# Shared across batches so image downloads don't pay thread startup each time;
+# send_sample_images never has more than IMAGES_PER_BATCH downloads running
+download_pool = ThreadPoolExecutor(max_workers=IMAGES_PER_BATCH, thread_name_prefix='image-download')
 
 
 def signal_handler(signum, frame):
-    global shutdown_requested
     logger.info(f"\nReceived signal {signum}, shutting down gracefully...")
-    shutdown_requested = True
+    shutdown_event.set()
 
 
 def load_config(config_path: str) -> dict:
@@ -46,9 +64,73 @@ def load_config(config_path: str) -> dict:
         return json.load(f)
 
 
-def main():
-    global shutdown_requested
+def send_sample_images(sensor, slack_client, candidates, images_dir, image_stats):
+    images_target = IMAGES_PER_BATCH
+    
+    # Keep only as many downloads in flight as online images are still needed,
+    # refilling as offline cameras turn up, so no extra JPEGs get fetched
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path_prefix = os.path.join(images_dir, 'cam_')
+    remaining = iter(candidates)
+    
+    in_flight = {}
+    online = []
+    while len(online) < images_target:
+        while len(online) + len(in_flight) < images_target:
+            sample_record = next(remaining, None)
+            if sample_record is None:
+                break
+            image_path = f"{path_prefix}{sample_record['camera_id']}_{timestamp}.jpg"
+            future = download_pool.submit(
+                sensor.download_image,
+                sample_record['image_url'],
+                image_path
+            )
+            in_flight[future] = sample_record
+        if not in_flight:
+            break
+        
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            sample_record = in_flight.pop(future)
+            
+            try:
+                # download_image returns None for offline cameras
+                downloaded = future.result()
+                
+                if downloaded:
+                    # Camera is online - queue the file download_image actually wrote
+                    online.append((sample_record, downloaded))
+                    logger.info(f"[OK] Found ONLINE camera {len(online)}/{images_target}: {sample_record.get('name', 'Unknown')}")
+                else:
+                    # Camera is offline - skip
+                    image_stats['offline'] += 1
+                    logger.info(f"[SKIP] Camera offline: {sample_record.get('name', 'Unknown')}")
+                    
+            except Exception as e:
+                logger.warning(f"Failed to process camera image: {e}")
+    
+    if online and slack_client.send_camera_alerts_batch(online):
+        image_stats['online'] += len(online)
+        logger.info(f"[OK] Sent {len(online)} ONLINE cameras to Slack")
     
+    if len(online) < images_target:
+        logger.info(f"[INFO] Only {len(online)}/{images_target} online cameras found in sample")
+
+
+def image_worker(image_queue, sensor, slack_client, images_dir, image_stats):
+    # Runs until main() puts the None sentinel on the queue
+    while True:
+        candidates = image_queue.get()
+        if candidates is None:
+            break
+        try:
+            send_sample_images(sensor, slack_client, candidates, images_dir, image_stats)
+        except Exception as e:
+            logger.warning(f"Image worker failed: {e}")
+
+
+def main():
     parser = argparse.ArgumentParser(description='NYC Camera Streaming Pipeline')
     parser.add_argument('--config', default='snowflake_config.json',
                        help='Snowflake config file path')
@@ -56,6 +138,8 @@ def main():
                        help='511NY API key')
     parser.add_argument('--interval', type=float, default=60.0,
                        help='Seconds between batches (default: 60)')
+    parser.add_argument('--channels', type=int, default=1,
+                       help='Snowpipe Streaming channels to shard rows across (default: 1)')
     parser.add_argument('--slack-token', help='Slack bot token')
     parser.add_argument('--slack-channel', default='#traffic-cameras',
                        help='Slack channel for notifications')
@@ -99,7 +183,8 @@ def main():
         sys.exit(1)
     
     logger.info("Initializing Snowpipe Streaming REST API client...")
-    streaming_client = SnowpipeStreamingClient(args.config)
+    # Host discovery and channel open run in the background during the rest of startup
+    streaming_client = SnowpipeStreamingClient(args.config, num_channels=args.channels, eager_init=True)
     
     slack_client: Optional[SlackNotifier] = None
     if args.slack_token:
@@ -126,12 +211,9 @@ def main():
     logger.info(f"Batch interval: {args.interval} seconds")
     logger.info("Setting up Snowpipe Streaming connection...")
     
-    logger.info("Discovering ingest host...")
-    streaming_client.discover_ingest_host()
+    logger.info("Waiting for ingest host discovery and channel open...")
+    streaming_client.wait_until_ready()
     logger.info(f"[OK] Ingest host: {streaming_client.ingest_host}")
-    
-    logger.info("Opening streaming channel...")
-    streaming_client.open_channel()
     logger.info("[OK] Channel opened successfully")
     logger.info("Snowpipe Streaming connection ready!")
     
@@ -142,8 +224,19 @@ def main():
     
     batch_num = 0
     total_records_sent = 0
-    total_online_cameras = 0
-    total_offline_cameras = 0
+    # Updated by the image worker thread
+    image_stats = {'online': 0, 'offline': 0}
+    
+    image_queue: queue.Queue = queue.Queue(maxsize=2)
+    image_thread: Optional[threading.Thread] = None
+    if slack_client:
+        image_thread = threading.Thread(
+            target=image_worker,
+            args=(image_queue, sensor, slack_client, args.images_dir, image_stats),
+            name='image-worker',
+            daemon=True
+        )
+        image_thread.start()
     
     # Send startup notification to Slack
     if slack_client:
@@ -156,21 +249,63 @@ def main():
         slack_client.send_message(startup_msg)
         logger.info("[OK] Sent startup notification to Slack")
     
+    # Resolve the hot-path callables and settings once instead of every batch
+    fetch_cameras = sensor.fetch_cameras
+    process_cameras = sensor.process_cameras
+    append_rows = streaming_client.append_rows
+    now = time.monotonic
+    interval = args.interval
+    
     try:
-        while not shutdown_requested:
-            batch_start = time.time()
+        # Batches are scheduled on fixed monotonic deadlines so the cadence doesn't drift
+        next_batch = now()
+        first_batch = True
+        # Batches that failed to append, retried oldest first on later iterations
+        pending = deque(maxlen=10)
+        append_failures = 0
+        while not shutdown_event.is_set():
             batch_num += 1
             logger.info(f"\n--- Batch {batch_num} ---")
             
-            cameras = sensor.fetch_cameras()
-            records = sensor.process_cameras(cameras)
+            while pending:
+                try:
+                    append_rows(pending[0])
+                except PartialAppendError as e:
+                    # Keep only what is still unsent so acknowledged rows aren't duplicated
+                    total_records_sent += len(pending[0]) - len(e.unsent_rows)
+                    pending[0] = e.unsent_rows
+                    logger.warning(f"[RETRY] {len(pending)} pending batch(es) still failing: {e.cause}")
+                    break
+                retried = pending.popleft()
+                total_records_sent += len(retried)
+                logger.info(f"[OK] Re-sent {len(retried)} pending records to Snowpipe Streaming")
+            
+            # The startup connectivity check already fetched the first batch
+            if first_batch:
+                first_batch = False
+            else:
+                cameras = fetch_cameras()
+            records = process_cameras(cameras)
             
             logger.info(f"Captured {len(records)} camera records")
             
             if records:
-                streaming_client.append_rows(records)
-                total_records_sent += len(records)
-                logger.info(f"[OK] Successfully sent {len(records)} records to Snowpipe Streaming")
+                try:
+                    append_rows(records)
+                    total_records_sent += len(records)
+                    append_failures = 0
+                    logger.info(f"[OK] Successfully sent {len(records)} records to Snowpipe Streaming")
+                except PartialAppendError as e:
+                    append_failures += 1
+                    if append_failures >= MAX_APPEND_FAILURES:
+                        raise
+                    total_records_sent += len(records) - len(e.unsent_rows)
+                    if len(pending) == pending.maxlen:
+                        logger.warning(f"[DROP] Retry queue full, dropping oldest {len(pending[0])} records")
+                    # Chunks already acknowledged are not re-queued
+                    pending.append(e.unsent_rows)
+                    logger.error(f"[ERROR] Snowpipe append failed ({append_failures}/{MAX_APPEND_FAILURES}), "
+                                 f"queued {len(e.unsent_rows)}/{len(records)} records for retry: {e.cause}")
                 
                 if pg_client:
                     pg_client.insert_records(records)
@@ -183,66 +318,33 @@ def main():
                         f"• Records this batch: `{len(records)}`\n"
                         f"• Total records sent: `{total_records_sent}`\n"
                         f"• Cameras tracked: `{len(cameras)}`\n"
-                        f"• Online cameras sent to Slack: `{total_online_cameras}`\n"
-                        f"• Offline cameras skipped: `{total_offline_cameras}`"
+                        f"• Online cameras sent to Slack: `{image_stats['online']}`\n"
+                        f"• Offline cameras skipped: `{image_stats['offline']}`"
                     )
-                    slack_client.send_message(status_msg)
-                    logger.info(f"[OK] Sent batch {batch_num} status to Slack")
+                    slack_client.send_message_async(status_msg)
+                    logger.info(f"[OK] Queued batch {batch_num} status for Slack")
                 
-                # Send sample camera images every batch (try up to 5, send 3 online)
+                # Hand image sampling to the background worker so a slow
+                # download never delays the next Snowpipe batch
                 if slack_client:
-                    import random
                     # Get cameras with valid image URLs
                     cameras_with_images = [r for r in records if r.get('image_url')]
-                    # Shuffle to get random selection
-                    random.shuffle(cameras_with_images)
-                    
-                    images_sent = 0
-                    images_target = 3
-                    attempts = 0
-                    max_attempts = min(10, len(cameras_with_images))  # Try up to 10 cameras
+                    # Pick a random sample of cameras to try
+                    candidates = random.sample(cameras_with_images, min(IMAGE_CANDIDATES, len(cameras_with_images)))
                     
-                    for sample_record in cameras_with_images:
-                        if images_sent >= images_target or attempts >= max_attempts:
-                            break
-                        
-                        attempts += 1
-                        
-                        try:
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                            image_path = os.path.join(
-                                args.images_dir,
-                                f"cam_{sample_record['camera_id']}_{timestamp}.jpg"
-                            )
-                            
-                            # download_image returns None for offline cameras
-                            downloaded = sensor.download_image(
-                                sample_record['image_url'],
-                                image_path
-                            )
-                            
-                            if downloaded:
-                                # Camera is online - send to Slack
-                                slack_client.send_camera_alert(sample_record, image_path)
-                                images_sent += 1
-                                total_online_cameras += 1
-                                logger.info(f"[OK] Sent ONLINE camera {images_sent}/{images_target} to Slack: {sample_record.get('name', 'Unknown')}")
-                            else:
-                                # Camera is offline - skip
-                                total_offline_cameras += 1
-                                logger.info(f"[SKIP] Camera offline: {sample_record.get('name', 'Unknown')}")
-                                
-                        except Exception as e:
-                            logger.warning(f"Failed to process camera image: {e}")
-                    
-                    if images_sent < images_target:
-                        logger.info(f"[INFO] Only {images_sent}/{images_target} online cameras found in sample")
+                    try:
+                        image_queue.put_nowait(candidates)
+                    except queue.Full:
+                        logger.warning("[SKIP] Image worker still busy, skipping image sampling this batch")
             
-            elapsed = time.time() - batch_start
-            wait_time = max(0, args.interval - elapsed)
-            if wait_time > 0 and not shutdown_requested:
+            next_batch += interval
+            wait_time = next_batch - now()
+            if wait_time > 0:
                 logger.info(f"Waiting {wait_time:.1f}s until next batch...")
-                time.sleep(wait_time)
+                shutdown_event.wait(wait_time)
+            else:
+                # Fell behind; start over from now rather than bursting to catch up
+                next_batch = now()
     
     except Exception as e:
         logger.error(f"Error during streaming: {e}")
@@ -256,17 +358,26 @@ def main():
         
         streaming_client.print_stats()
         
+        if image_thread:
+            # Drop samples that never started, then let the current one finish
+            while not image_queue.empty():
+                image_queue.get_nowait()
+            image_queue.put(None)
+            image_thread.join(timeout=30)
+        
         # Send shutdown notification to Slack
         if slack_client:
             shutdown_msg = (
                 f"🛑 *NYC Camera Pipeline Stopped*\n"
                 f"• Total batches: `{batch_num}`\n"
                 f"• Total records sent: `{total_records_sent}`\n"
-                f"• Online cameras sent to Slack: `{total_online_cameras}`\n"
-                f"• Offline cameras skipped: `{total_offline_cameras}`\n"
+                f"• Online cameras sent to Slack: `{image_stats['online']}`\n"
+                f"• Offline cameras skipped: `{image_stats['offline']}`\n"
                 f"• Runtime stats logged"
             )
             try:
+                # Flush queued status posts first so the shutdown notice comes last
+                slack_client.close()
                 slack_client.send_message(shutdown_msg)
                 logger.info("[OK] Sent shutdown notification to Slack")
             except Exception as e:
@@ -276,6 +387,8 @@ def main():
         streaming_client.close_channel()
         logger.info("[OK] Channel closed")
         
+        download_pool.shutdown(wait=False, cancel_futures=True)
+        
         logger.info("Cleaning up sensor...")
         sensor.cleanup()
         logger.info("[OK] Sensor cleaned up")
@@ -1,146 +1,342 @@
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+import os
 import socket
+import tempfile
+import functools
 import hashlib
+import threading
+from concurrent.futures import Future
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
+from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
 # Known offline/placeholder image signatures
 # These are file sizes and hashes of common "No live camera feed" images
 OFFLINE_IMAGE_SIZES = {15136, 15000, 14000, 16000}  # Common placeholder sizes in bytes
-OFFLINE_IMAGE_HASHES = set()  # Will be populated with known offline image hashes
+OFFLINE_IMAGE_HASHES = set()  # Known offline image hashes, filled from the saved placeholder samples
+OFFLINE_PLACEHOLDER_SIZE = 15136  # Exact size of the "No live camera feed" placeholder
+
+# Only images at one of these sizes can be a placeholder, so only they get hashed
+_FINGERPRINT_SIZES = OFFLINE_IMAGE_SIZES | {OFFLINE_PLACEHOLDER_SIZE}
+
+# Saved placeholder images whose fingerprints are known before the first poll
+PLACEHOLDER_SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'badimage')
+
+# (connect, read) so one stalled camera cannot hold a worker for long
+DOWNLOAD_TIMEOUT = (5, 25)
+
+# 511NY encodes the Disabled/Blocked flags as the strings 'True'/'False'
+_TRUE = 'True'
+
+
+def float_or_none(value) -> Optional[float]:
+    # 511NY sends numbers as strings and leaves missing ones empty
+    return float(value) if value else None
+
+
+# Resolved once per process so every sensor and record is tagged consistently
+@functools.lru_cache(maxsize=1)
+def local_hostname() -> str:
+    return socket.gethostname()
+
+
+@functools.lru_cache(maxsize=1)
+def local_ip() -> str:
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        ip = s.getsockname()[0]
+        s.close()
+        return ip
+    except Exception:
+        return "127.0.0.1"
+
+
+def conditional_headers(cached: Optional[Tuple]) -> Dict[str, str]:
+    # cached is (ETag, Last-Modified, value) from an earlier 200, or None
+    headers = {}
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+    return headers
+
+
+# GET and parse a JSON endpoint, revalidating against cache (url -> ETag,
+# Last-Modified, parsed data); a 304 hands back the earlier parse untouched
+def get_json_conditional(session: requests.Session, url: str, cache: Dict, timeout: int = 30):
+    cached = cache.get(url)
+    headers = conditional_headers(cached)
+    
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        return cached[2]
+    response.raise_for_status()
+    
+    data = orjson.loads(response.content)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if etag or last_modified:
+        cache[url] = (etag, last_modified, data)
+    else:
+        cache.pop(url, None)
+    return data
+
+
+def bulk_uuid4(n: int) -> List[str]:
+    # One urandom read for the whole batch instead of one syscall per record
+    buf = os.urandom(16 * n)
+    return [str(UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
+_SAMPLE_BYTES = 1024
+
+
+def _fingerprint(content: bytes) -> str:
+    # 64-bit BLAKE2b over the head, middle and tail plus the length; candidates are
+    # already size-matched, so the samples only need to tell placeholders apart
+    digest = hashlib.blake2b(digest_size=8)
+    size = len(content)
+    if size <= 3 * _SAMPLE_BYTES:
+        digest.update(content)
+    else:
+        mid = size // 2
+        digest.update(content[:_SAMPLE_BYTES])
+        digest.update(content[mid:mid + _SAMPLE_BYTES])
+        digest.update(content[-_SAMPLE_BYTES:])
+    digest.update(size.to_bytes(4, 'little'))
+    return digest.hexdigest()
+
+
+def preload_placeholder_samples(directory: str = PLACEHOLDER_SAMPLES_DIR) -> int:
+    # Prime the known-hash set so a cold start matches placeholders straight away
+    loaded = 0
+    if not os.path.isdir(directory):
+        return loaded
+    for entry in os.scandir(directory):
+        if not entry.is_file():
+            continue
+        with open(entry.path, 'rb') as f:
+            content = f.read()
+        _FINGERPRINT_SIZES.add(len(content))
+        OFFLINE_IMAGE_HASHES.add(_fingerprint(content))
+        loaded += 1
+    return loaded
+
+
+preload_placeholder_samples()
+
+
+def build_session() -> requests.Session:
+    # Keep-alive session so the TCP/TLS handshake to 511NY is paid once
+    session = requests.Session()
+    # Explicit so the large JSON listings always come back compressed
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 
 class NYCCameraSensor:
     
-    def __init__(self, api_key: str, base_url: str = "https://511ny.org/api/getcameras"):
+    def __init__(self, api_key: str, base_url: str = "https://511ny.org/api/getcameras",
+                 session: Optional[requests.Session] = None):
         self.api_key = api_key
         self.base_url = base_url
-        self.hostname = socket.gethostname()
-        self.ip_address = self._get_ip()
-        self.offline_image_hash = None  # Will store hash of first detected offline image
+        self.hostname = local_hostname()
+        self.ip_address = local_ip()
+        self._record_cache: Dict[str, Tuple[Dict, Dict]] = {}  # camera ID -> (source, record template)
+        self._inflight: Dict[Tuple[str, str], Future] = {}  # (image URL, output path) -> download already in progress
+        self._inflight_lock = threading.Lock()
+        self._response_cache: Dict[str, Tuple] = {}  # API URL -> (ETag, Last-Modified, parsed JSON)
+        self._status_cache: Dict[str, Tuple[Optional[str], Optional[str], Dict]] = {}  # image URL -> (ETag, Last-Modified, status)
+        
+        # A session passed in is shared with other sensors and closed by its owner
+        self._owns_session = session is None
+        self._session = session or build_session()
         
         logger.info("NYC Camera Sensor initialized")
         logger.info(f"  API URL: {self.base_url}")
         logger.info(f"  Hostname: {self.hostname}")
         logger.info(f"  IP: {self.ip_address}")
     
-    def _get_ip(self) -> str:
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
-        except Exception:
-            return "127.0.0.1"
-    
     def fetch_cameras(self) -> List[Dict]:
         try:
             url = f"{self.base_url}?key={self.api_key}&format=json"
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = get_json_conditional(self._session, url, self._response_cache)
             cameras = data if isinstance(data, list) else data.get('cameras', [])
             
             logger.info(f"[OK] Fetched {len(cameras)} cameras from API")
             return cameras
             
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"[ERROR] Failed to fetch cameras: {e}")
             return []
     
-    def process_cameras(self, cameras: List[Dict]) -> List[Dict]:
-        import uuid
-        
-        processed = []
-        timestamp = datetime.utcnow().isoformat()
-        
-        for cam in cameras:
-            if cam.get('Disabled') == 'True' or cam.get('Blocked') == 'True':
-                continue
-            
-            record = {
-                'uuid': str(uuid.uuid4()),
-                'camera_id': str(cam.get('ID', '')),
+    def _camera_template(self, cam: Dict) -> Dict:
+        """Return the static part of a camera record, rebuilding it if the source changed."""
+        key = str(cam.get('ID', ''))
+        cached = self._record_cache.get(key)
+        if cached is None or cached[0] != cam:
+            template = {
+                'camera_id': key,
                 'name': cam.get('Name', ''),
-                'latitude': float(cam.get('Latitude', 0)) if cam.get('Latitude') else None,
-                'longitude': float(cam.get('Longitude', 0)) if cam.get('Longitude') else None,
+                'latitude': float_or_none(cam.get('Latitude')),
+                'longitude': float_or_none(cam.get('Longitude')),
                 'direction_of_travel': cam.get('DirectionOfTravel', ''),
                 'roadway_name': cam.get('RoadwayName', ''),
                 'video_url': cam.get('VideoUrl', ''),
                 'image_url': cam.get('Url', ''),
-                'disabled': cam.get('Disabled', 'False') == 'True',
-                'blocked': cam.get('Blocked', 'False') == 'True',
-                'image_timestamp': timestamp,
-                'ingest_timestamp': timestamp,
+                # Disabled/blocked cameras are dropped, so the flags are always False here
+                'disabled': False,
+                'blocked': False,
                 'hostname': self.hostname,
                 'ip_address': self.ip_address
             }
-            processed.append(record)
+            cached = self._record_cache[key] = (cam, template)
+        return cached[1]
+    
+    def process_cameras(self, cameras: List[Dict]) -> List[Dict]:
+        timestamp = datetime.utcnow().isoformat()
+        template = self._camera_template
+        
+        # Camera metadata barely changes between batches; only stamp the per-batch fields.
+        # ingest_timestamp is left to the tables' DEFAULT CURRENT_TIMESTAMP.
+        active = [
+            cam for cam in cameras
+            if cam.get('Disabled') != _TRUE and cam.get('Blocked') != _TRUE
+        ]
+        processed = [
+            {
+                'uuid': uuid,
+                **template(cam),
+                'image_timestamp': timestamp
+            }
+            for uuid, cam in zip(bulk_uuid4(len(active)), active)
+        ]
         
         logger.info(f"Processed {len(processed)} active cameras")
         return processed
     
     def download_image(self, url: str, output_path: str) -> Optional[str]:
         """Download camera image and return path if successful and camera is online."""
+        # Concurrent requests for the same URL and file share the first caller's
+        # download; a different output path is its own download, so every caller
+        # gets back a file that exists
+        key = (url, output_path)
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        
+        if not owner:
+            return pending.result()
+        
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            content = response.content
-            content_length = len(content)
+            result = self._download_image(url, output_path)
+            pending.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            if not pending.done():
+                pending.set_result(None)
+    
+    def _download_image(self, url: str, output_path: str) -> Optional[str]:
+        tmp_path = None
+        try:
+            with self._session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                
+                # Skip the body entirely when the server already tells us it's tiny
+                declared_length = int(response.headers.get('Content-Length') or 0)
+                if 0 < declared_length < 5000:
+                    logger.warning(f"Image too small ({declared_length} bytes), likely error")
+                    return None
+                
+                # The "No live camera feed" placeholder is identified by size alone,
+                # so its body is never fetched or hashed
+                if declared_length == OFFLINE_PLACEHOLDER_SIZE:
+                    logger.info(f"Camera offline: Placeholder size match ({declared_length} bytes)")
+                    return None
+                
+                # Stream in 64 KB chunks to a temp file beside the target so nothing
+                # is held in memory; readers never see a partial image
+                content_length = 0
+                with tempfile.NamedTemporaryFile(
+                    dir=os.path.dirname(output_path) or '.', suffix='.part', delete=False
+                ) as f:
+                    tmp_path = f.name
+                    for chunk in response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+                        content_length += len(chunk)
             
             # Check if image is too small (likely error)
             if content_length < 5000:
                 logger.warning(f"Image too small ({content_length} bytes), likely error")
                 return None
             
-            # Check if this is an offline/placeholder image
-            is_offline, reason = self._is_offline_image(content, content_length)
-            if is_offline:
-                logger.info(f"Camera offline: {reason}")
+            if content_length == OFFLINE_PLACEHOLDER_SIZE:
+                logger.info(f"Camera offline: Placeholder size match ({content_length} bytes)")
                 return None
             
-            with open(output_path, 'wb') as f:
-                f.write(content)
+            # Any other size is a live image; no need to fingerprint it
+            if content_length in _FINGERPRINT_SIZES:
+                # Candidates are placeholder-sized (about 16 KB), so reading back
+                # what landed on disk is cheap
+                with open(tmp_path, 'rb') as f:
+                    body = f.read()
+                
+                # Check if this is an offline/placeholder image
+                is_offline, reason = self._is_offline_image(_fingerprint(body), content_length)
+                if is_offline:
+                    logger.info(f"Camera offline: {reason}")
+                    return None
             
+            os.replace(tmp_path, output_path)
+            tmp_path = None
             logger.info(f"Downloaded image to {output_path} ({content_length} bytes)")
             return output_path
             
         except Exception as e:
             logger.error(f"Failed to download image: {e}")
             return None
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
     
-    def _is_offline_image(self, content: bytes, content_length: int) -> Tuple[bool, str]:
+    def _is_offline_image(self, image_hash: str, content_length: int) -> Tuple[bool, str]:
         """
-        Detect if image is an offline placeholder.
+        Detect if image is an offline placeholder from its fingerprint and size.
         Returns (is_offline, reason).
         """
-        # Calculate hash of the image
-        image_hash = hashlib.md5(content).hexdigest()
+        # Check for exact known placeholder size (15136 bytes is common)
+        if content_length == OFFLINE_PLACEHOLDER_SIZE:
+            return True, f"Placeholder size match ({content_length} bytes)"
         
-        # Check against known offline image hashes
+        # Check against known offline image hashes (preloaded from saved samples)
         if image_hash in OFFLINE_IMAGE_HASHES:
             return True, f"Known offline image hash: {image_hash[:8]}"
         
-        # Check if we've seen this as an offline image before
-        if self.offline_image_hash and image_hash == self.offline_image_hash:
-            return True, f"Previously detected offline image"
-        
-        # Check for exact known placeholder size (15136 bytes is common)
-        if content_length == 15136:
-            # This is the exact size of the "No live camera feed" placeholder
-            # Store this hash for future detection
-            if not self.offline_image_hash:
-                self.offline_image_hash = image_hash
-                OFFLINE_IMAGE_HASHES.add(image_hash)
-                logger.info(f"Detected offline placeholder image (hash: {image_hash[:8]})")
-            return True, f"Placeholder size match ({content_length} bytes)"
-        
         # Check if file size is suspiciously uniform (many offline images same size)
         if content_length in OFFLINE_IMAGE_SIZES:
             # Additional check: try to detect "No live camera" text pattern
@@ -156,27 +352,32 @@ class NYCCameraSensor:
         Returns status dict with is_online and details.
         """
         try:
-            response = requests.get(image_url, timeout=15)
-            response.raise_for_status()
-            
-            content = response.content
-            content_length = len(content)
+            # Revalidate against the last frame we classified for this URL
+            cached = self._status_cache.get(image_url)
+            headers = conditional_headers(cached)
             
-            if content_length < 5000:
-                return {
-                    'is_online': False,
-                    'reason': 'Image too small',
-                    'size': content_length
-                }
+            with self._session.get(image_url, headers=headers, timeout=15, stream=True) as response:
+                if response.status_code == 304 and cached:
+                    return cached[2]
+                response.raise_for_status()
+                
+                # Content-Length alone classifies most images, so the body is only
+                # read when it could be too small or a placeholder
+                declared_length = int(response.headers.get('Content-Length') or 0)
+                if declared_length >= 5000 and declared_length not in _FINGERPRINT_SIZES:
+                    status = {
+                        'is_online': True,
+                        'reason': 'Camera active',
+                        'size': declared_length
+                    }
+                else:
+                    status = self._classify_image(response.content)
             
-            is_offline, reason = self._is_offline_image(content, content_length)
-            
-            return {
-                'is_online': not is_offline,
-                'reason': reason if is_offline else 'Camera active',
-                'size': content_length,
-                'hash': hashlib.md5(content).hexdigest()[:8]
-            }
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._status_cache[image_url] = (etag, last_modified, status)
+            return status
             
         except Exception as e:
             return {
@@ -185,5 +386,41 @@ class NYCCameraSensor:
                 'size': 0
             }
     
+    def _classify_image(self, content: bytes) -> Dict:
+        content_length = len(content)
+        
+        if content_length < 5000:
+            return {
+                'is_online': False,
+                'reason': 'Image too small',
+                'size': content_length
+            }
+        
+        if content_length == OFFLINE_PLACEHOLDER_SIZE:
+            return {
+                'is_online': False,
+                'reason': f'Placeholder size match ({content_length} bytes)',
+                'size': content_length
+            }
+        
+        if content_length not in _FINGERPRINT_SIZES:
+            return {
+                'is_online': True,
+                'reason': 'Camera active',
+                'size': content_length
+            }
+        
+        image_hash = _fingerprint(content)
+        is_offline, reason = self._is_offline_image(image_hash, content_length)
+        
+        return {
+            'is_online': not is_offline,
+            'reason': reason if is_offline else 'Camera active',
+            'size': content_length,
+            'hash': image_hash[:8]
+        }
+    
     def cleanup(self):
+        if self._owns_session:
+            self._session.close()
         logger.info("NYC Camera sensor cleaned up")
@@ -1,11 +1,60 @@
+import csv
+import io
 import logging
+from contextlib import contextmanager
+from operator import itemgetter
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from typing import List, Dict, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+CAMERA_COLUMNS = (
+    'uuid', 'camera_id', 'name', 'latitude', 'longitude',
+    'direction_of_travel', 'roadway_name', 'video_url', 'image_url',
+    'disabled', 'blocked', 'image_timestamp',
+    'hostname', 'ip_address'
+)
+
+# Pulls a record's values out in column order in one C-level call
+_camera_row = itemgetter(*CAMERA_COLUMNS)
+
+INSERT_SQL = f"""
+    INSERT INTO nyc_camera_data ({', '.join(CAMERA_COLUMNS)})
+    VALUES %s
+    ON CONFLICT (uuid) DO NOTHING
+"""
+
+# Per-row placeholder template, composed once instead of per execute_values call
+INSERT_TEMPLATE = f"({', '.join(['%s'] * len(CAMERA_COLUMNS))})"
+
+# Large enough that a full 511NY camera list goes out as a single statement
+INSERT_PAGE_SIZE = 1000
+
+# Above this many rows, stream through COPY into a staging table instead
+COPY_THRESHOLD = 5000
+
+# NULL marker for the staging COPY, so empty strings stay empty strings
+_COPY_NULL = r'\N'
+
+COPY_STAGING_SQL = """
+    CREATE TEMP TABLE nyc_camera_data_staging
+    (LIKE nyc_camera_data INCLUDING DEFAULTS) ON COMMIT DROP
+"""
+
+COPY_SQL = f"""
+    COPY nyc_camera_data_staging ({', '.join(CAMERA_COLUMNS)})
+    FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')
+"""
+
+COPY_MERGE_SQL = f"""
+    INSERT INTO nyc_camera_data ({', '.join(CAMERA_COLUMNS)})
+    SELECT {', '.join(CAMERA_COLUMNS)} FROM nyc_camera_data_staging
+    ON CONFLICT (uuid) DO NOTHING
+"""
+
 
 class PostgreSQLClient:
     
@@ -17,22 +66,35 @@ class PostgreSQLClient:
             'user': user,
             'password': password
         }
-        self.conn = None
+        self.pool = None
         logger.info(f"PostgreSQL client initialized for {host}:{port}/{database}")
     
     def connect(self):
-        if self.conn is None or self.conn.closed:
-            self.conn = psycopg2.connect(**self.connection_params)
+        if self.pool is None or self.pool.closed:
+            self.pool = ThreadedConnectionPool(minconn=1, maxconn=8, **self.connection_params)
             logger.info("Connected to PostgreSQL")
     
     def disconnect(self):
-        if self.conn and not self.conn.closed:
-            self.conn.close()
+        if self.pool and not self.pool.closed:
+            self.pool.closeall()
             logger.info("Disconnected from PostgreSQL")
     
-    def create_table(self):
+    @contextmanager
+    def connection(self):
         self.connect()
-        with self.conn.cursor() as cur:
+        conn = self.pool.getconn()
+        try:
+            yield conn
+        except Exception:
+            # Never hand a connection stuck in an aborted transaction back to the pool
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn, close=conn.closed != 0)
+    
+    def create_table(self):
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 CREATE TABLE IF NOT EXISTS nyc_camera_data (
                     id SERIAL PRIMARY KEY,
@@ -57,45 +119,49 @@ class PostgreSQLClient:
                 CREATE INDEX IF NOT EXISTS idx_image_timestamp ON nyc_camera_data(image_timestamp);
                 CREATE INDEX IF NOT EXISTS idx_roadway ON nyc_camera_data(roadway_name);
             """)
-            self.conn.commit()
+            conn.commit()
             logger.info("PostgreSQL table created/verified")
     
     def insert_records(self, records: List[Dict]) -> int:
         if not records:
             return 0
         
-        self.connect()
+        # Positional tuples let execute_values skip a dict lookup per value
+        rows = list(map(_camera_row, records))
         
-        insert_sql = """
-            INSERT INTO nyc_camera_data (
-                uuid, camera_id, name, latitude, longitude,
-                direction_of_travel, roadway_name, video_url, image_url,
-                disabled, blocked, image_timestamp, ingest_timestamp,
-                hostname, ip_address
-            ) VALUES (
-                %(uuid)s, %(camera_id)s, %(name)s, %(latitude)s, %(longitude)s,
-                %(direction_of_travel)s, %(roadway_name)s, %(video_url)s, %(image_url)s,
-                %(disabled)s, %(blocked)s, %(image_timestamp)s, %(ingest_timestamp)s,
-                %(hostname)s, %(ip_address)s
-            )
-            ON CONFLICT (uuid) DO NOTHING
-        """
+        with self.connection() as conn:
+            try:
+                with conn.cursor() as cur:
+                    if len(rows) > COPY_THRESHOLD:
+                        self._copy_rows(cur, rows)
+                    else:
+                        execute_values(cur, INSERT_SQL, rows, template=INSERT_TEMPLATE, page_size=INSERT_PAGE_SIZE)
+                    conn.commit()
+                
+                logger.info(f"Inserted {len(records)} records to PostgreSQL")
+                return len(records)
+            except Exception as e:
+                logger.error(f"Failed to insert records: {e}")
+                conn.rollback()
+                return 0
+    
+    def _copy_rows(self, cur, rows: List[tuple]):
+        # COPY cannot skip duplicates itself, so land the rows in a temp table
+        # and let one INSERT ... SELECT apply ON CONFLICT
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerows(
+            tuple(_COPY_NULL if value is None else value for value in row)
+            for row in rows
+        )
+        buf.seek(0)
         
-        try:
-            with self.conn.cursor() as cur:
-                execute_batch(cur, insert_sql, records)
-                self.conn.commit()
-            
-            logger.info(f"Inserted {len(records)} records to PostgreSQL")
-            return len(records)
-        except Exception as e:
-            logger.error(f"Failed to insert records: {e}")
-            self.conn.rollback()
-            return 0
+        cur.execute(COPY_STAGING_SQL)
+        cur.copy_expert(COPY_SQL, buf)
+        cur.execute(COPY_MERGE_SQL)
     
     def get_recent_cameras(self, limit: int = 100) -> List[Dict]:
-        self.connect()
-        with self.conn.cursor() as cur:
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 SELECT * FROM nyc_camera_data
                 ORDER BY image_timestamp DESC
@@ -108,8 +174,7 @@ class PostgreSQLClient:
             return [dict(zip(columns, row)) for row in rows]
     
     def get_cameras_by_roadway(self, roadway: str) -> List[Dict]:
-        self.connect()
-        with self.conn.cursor() as cur:
+        with self.connection() as conn, conn.cursor() as cur:
             cur.execute("""
                 SELECT DISTINCT ON (camera_id) *
                 FROM nyc_camera_data
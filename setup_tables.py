@@ -116,23 +116,21 @@ def setup_snowflake(connection_name: str = None, external_volume: str = None):
             connection_name=os.getenv("SNOWFLAKE_CONNECTION_NAME") or "default"
         )
     
-    cur = conn.cursor()
-    
     logger.info("Creating Snowflake standard table...")
-    for stmt in SNOWFLAKE_DDL.strip().split(';'):
-        if stmt.strip():
-            cur.execute(stmt)
+    # The connector's own statement splitter copes with ';' inside strings and comments
+    for cur in conn.execute_string(SNOWFLAKE_DDL):
+        cur.close()
     logger.info("Snowflake standard table created")
     
     if external_volume:
         logger.info(f"Creating Snowflake Iceberg table with volume: {external_volume}")
         iceberg_ddl = SNOWFLAKE_ICEBERG_DDL.format(external_volume=external_volume)
-        cur.execute(iceberg_ddl)
+        for cur in conn.execute_string(iceberg_ddl):
+            cur.close()
         logger.info("Snowflake Iceberg table created")
     else:
         logger.info("Skipping Iceberg table (no external volume specified)")
     
-    cur.close()
     conn.close()
     logger.info("Snowflake setup complete")
 
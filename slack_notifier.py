@@ -1,17 +1,62 @@
 import os
+import queue
 import logging
-from typing import Optional
+import threading
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 
 logger = logging.getLogger(__name__)
 
+# How long the background sender waits for more messages to fold into one post
+COALESCE_WINDOW_SECONDS = 1.0
+
+
+# Camera metadata rarely changes, so the same cameras reuse their built blocks.
+# Callers only read or copy the result; the shared dicts are never mutated.
+@lru_cache(maxsize=1024)
+def _build_camera_blocks(name, roadway, direction, latitude, longitude, camera_id) -> tuple:
+    return (
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": f"📷 {name}",
+                "emoji": True
+            }
+        },
+        {
+            "type": "section",
+            "fields": [
+                {"type": "mrkdwn", "text": f"*Roadway:*\n{roadway}"},
+                {"type": "mrkdwn", "text": f"*Direction:*\n{direction}"},
+                {"type": "mrkdwn", "text": f"*Latitude:*\n{latitude}"},
+                {"type": "mrkdwn", "text": f"*Longitude:*\n{longitude}"}
+            ]
+        },
+        {
+            "type": "context",
+            "elements": [
+                {"type": "mrkdwn", "text": f"Camera ID: `{camera_id}`"}
+            ]
+        }
+    )
+
 
 class SlackNotifier:
     
     def __init__(self, token: str, default_channel: str = "#traffic-cameras"):
         self.client = WebClient(token=token)
+        # Sleep out Slack's Retry-After on 429s instead of failing the call
+        self.client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=3))
         self.default_channel = default_channel
+        
+        # Background sender, started on first use of the *_async methods
+        self._queue: "queue.Queue[Optional[Tuple[str, Optional[str]]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
         logger.info(f"Slack notifier initialized for channel: {default_channel}")
     
     def send_message(self, message: str, channel: Optional[str] = None) -> bool:
@@ -48,35 +93,21 @@ class SlackNotifier:
             logger.error(f"Failed to upload image: {e.response['error']}")
             return False
     
+    def _camera_blocks(self, camera_data: dict) -> list:
+        return list(_build_camera_blocks(
+            camera_data.get('name', 'Unknown Camera'),
+            camera_data.get('roadway_name', 'N/A'),
+            camera_data.get('direction_of_travel', 'N/A'),
+            camera_data.get('latitude', 'N/A'),
+            camera_data.get('longitude', 'N/A'),
+            camera_data.get('camera_id', 'N/A')
+        ))
+    
     def send_camera_alert(self, camera_data: dict, image_path: Optional[str] = None,
                           channel: Optional[str] = None) -> bool:
         target_channel = channel or self.default_channel
         
-        blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"📷 {camera_data.get('name', 'Unknown Camera')}",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {"type": "mrkdwn", "text": f"*Roadway:*\n{camera_data.get('roadway_name', 'N/A')}"},
-                    {"type": "mrkdwn", "text": f"*Direction:*\n{camera_data.get('direction_of_travel', 'N/A')}"},
-                    {"type": "mrkdwn", "text": f"*Latitude:*\n{camera_data.get('latitude', 'N/A')}"},
-                    {"type": "mrkdwn", "text": f"*Longitude:*\n{camera_data.get('longitude', 'N/A')}"}
-                ]
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {"type": "mrkdwn", "text": f"Camera ID: `{camera_data.get('camera_id', 'N/A')}`"}
-                ]
-            }
-        ]
+        blocks = self._camera_blocks(camera_data)
         
         try:
             self.client.chat_postMessage(
@@ -93,3 +124,96 @@ class SlackNotifier:
         except SlackApiError as e:
             logger.error(f"Failed to send camera alert: {e.response['error']}")
             return False
+    
+    def send_camera_alerts_batch(self, records_and_paths: List[Tuple[dict, str]],
+                                 channel: Optional[str] = None) -> bool:
+        """Post several cameras as one message and upload their images in one completion call."""
+        if not records_and_paths:
+            return True
+        
+        target_channel = channel or self.default_channel
+        
+        blocks = []
+        for camera_data, _ in records_and_paths:
+            blocks.extend(self._camera_blocks(camera_data))
+        
+        file_uploads = [
+            {"file": image_path, "title": camera_data.get('name', 'Camera Image')}
+            for camera_data, image_path in records_and_paths
+            if image_path and os.path.exists(image_path)
+        ]
+        
+        try:
+            self.client.chat_postMessage(
+                channel=target_channel,
+                blocks=blocks,
+                text=f"Camera update: {len(records_and_paths)} cameras"
+            )
+            
+            if file_uploads:
+                # files_upload_v2 uploads each file to its own URL and then shares
+                # them all with a single files.completeUploadExternal call
+                self.client.files_upload_v2(
+                    channel=target_channel,
+                    file_uploads=file_uploads
+                )
+                logger.info(f"Uploaded {len(file_uploads)} images to {target_channel}")
+            
+            return True
+        except SlackApiError as e:
+            logger.error(f"Failed to send camera alerts: {e.response['error']}")
+            return False
+    
+    def send_message_async(self, message: str, channel: Optional[str] = None):
+        self._enqueue((message, channel))
+    
+    def _enqueue(self, item: Tuple[str, Optional[str]]):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._drain, name='slack-sender', daemon=True)
+                self._worker.start()
+        self._queue.put(item)
+    
+    def _drain(self):
+        # Runs until close() puts the None sentinel on the queue
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            
+            # Fold anything arriving within the window into the same send
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get(timeout=COALESCE_WINDOW_SECONDS)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            try:
+                self._flush(batch)
+            except Exception as e:
+                logger.warning(f"Slack background send failed: {e}")
+    
+    def _flush(self, batch: List[Tuple[str, Optional[str]]]):
+        # One post per channel, with its messages in the order they were queued
+        by_channel = {}
+        for message, channel in batch:
+            by_channel.setdefault(channel, []).append(message)
+        for channel, messages in by_channel.items():
+            self.send_message("\n\n".join(messages), channel)
+    
+    def close(self, timeout: float = 30):
+        """Send anything still queued, then stop the background sender."""
+        with self._worker_lock:
+            worker = self._worker
+            # A later send starts a fresh worker instead of queueing behind a stopped one
+            self._worker = None
+            if worker:
+                self._queue.put(None)
+        if worker:
+            worker.join(timeout=timeout)
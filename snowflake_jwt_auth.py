@@ -11,23 +11,28 @@ Based on Snowflake's authentication documentation:
 - Token: https://docs.snowflake.com/en/user-guide/authentication-programmatic-tokens
 """
 
-import jwt
 import time
+import base64
+import orjson
 import logging
+import threading
 import requests
 from datetime import datetime, timedelta, timezone
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
 from hashlib import sha256
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Refresh cached tokens this many seconds before they actually expire
+TOKEN_REFRESH_MARGIN = 60
+# Lifetime assumed for an OAuth token whose expiry cannot be read
+DEFAULT_OAUTH_TOKEN_TTL = 9 * 60
+
 
 class SnowflakeJWTAuth:
     """Handles authentication for Snowflake (JWT or Access Token)."""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, session: Optional[requests.Session] = None):
         """
         Initialize authentication.
         
@@ -37,11 +42,21 @@ class SnowflakeJWTAuth:
         
         Args:
             config: Configuration dictionary
+            session: Optional requests session to reuse for the OAuth exchange
         """
         self.config = config
+        self.session = session or requests.Session()
         self.account = config['account'].upper()
         self.user = config['user'].upper()
         
+        # Minted tokens are reused until shortly before they expire
+        self._token_lock = threading.Lock()
+        self._cached_jwt: Optional[str] = None
+        self._cached_jwt_exp = 0.0
+        self._cached_oauth_token: Optional[str] = None
+        self._cached_oauth_exp = 0.0
+        self._oauth_lock = threading.Lock()
+        
         # Check which authentication method to use
         if 'pat' in config and config['pat']:
             # Use Programmatic Access Token (PAT) - simpler method
@@ -49,11 +64,22 @@ class SnowflakeJWTAuth:
             self.pat = config['pat']
             logger.info(f"PAT authentication initialized for user: {self.user}")
         elif config.get('private_key_file') or config.get('private_key_path'):
-            # Use JWT key-pair authentication
+            # Use JWT key-pair authentication. PyJWT and cryptography are only
+            # imported on this path so PAT-only deployments never load them
+            from cryptography.hazmat.primitives import serialization
+            
             self.auth_method = 'jwt'
             self.private_key_file = config.get('private_key_file') or config.get('private_key_path')
             self.private_key = self._load_private_key()
             self.qualified_username = f"{self.account}.{self.user}"
+            
+            # The key pair is fixed for this instance, so fingerprint it once
+            public_key_bytes = self.private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+            self.public_key_fp = 'SHA256:' + sha256(public_key_bytes).hexdigest().upper()
+            self._iss = f"{self.qualified_username}.{self.public_key_fp}"
             logger.info(f"JWT auth initialized for user: {self.qualified_username}")
         else:
             raise ValueError(
@@ -63,6 +89,9 @@ class SnowflakeJWTAuth:
     
     def _load_private_key(self):
         """Load private key from PEM file."""
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        
         try:
             with open(self.private_key_file, 'rb') as key_file:
                 private_key = serialization.load_pem_private_key(
@@ -85,17 +114,14 @@ class SnowflakeJWTAuth:
         """
         Generate a JWT token for Snowflake authentication.
         
+        The signed token is cached and reused until shortly before it expires.
+        
         Returns:
             Signed JWT token string
         """
-        # Get public key fingerprint (SHA256 hash)
-        public_key_bytes = self.private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        
-        # Calculate SHA256 fingerprint (uppercase hex)
-        public_key_fp = 'SHA256:' + sha256(public_key_bytes).hexdigest().upper()
+        with self._token_lock:
+            if self._cached_jwt and time.time() < self._cached_jwt_exp:
+                return self._cached_jwt
         
         # Create JWT payload
         # Use epoch timestamps (seconds since Unix epoch)
@@ -104,7 +130,7 @@ class SnowflakeJWTAuth:
         exp = int((now + timedelta(hours=1)).timestamp())
         
         payload = {
-            'iss': f"{self.qualified_username}.{public_key_fp}",
+            'iss': self._iss,
             'sub': self.qualified_username,
             'iat': iat,
             'exp': exp
@@ -114,6 +140,7 @@ class SnowflakeJWTAuth:
         logger.debug(f"JWT payload - sub: {payload['sub']}")
         
         # Sign the JWT
+        import jwt
         token = jwt.encode(
             payload,
             self.private_key,
@@ -121,6 +148,10 @@ class SnowflakeJWTAuth:
         )
         
         logger.debug("JWT token generated")
+        
+        with self._token_lock:
+            self._cached_jwt = token
+            self._cached_jwt_exp = exp - TOKEN_REFRESH_MARGIN
         return token
     
     def get_scoped_token(self) -> str:
@@ -150,9 +181,47 @@ class SnowflakeJWTAuth:
         """
         Exchange JWT for a scoped token using Snowflake's OAuth endpoint.
         
+        The token is cached until shortly before its expiry; the lock is held
+        across the exchange so concurrent callers wait for one request.
+        
         Returns:
             Scoped access token string
         """
+        with self._token_lock:
+            if self._cached_oauth_token and time.time() < self._cached_oauth_exp:
+                return self._cached_oauth_token
+        
+        with self._oauth_lock:
+            # Another caller may have refreshed it while we waited
+            if self._cached_oauth_token and time.time() < self._cached_oauth_exp:
+                return self._cached_oauth_token
+            
+            access_token, expires_in = self._exchange_jwt_for_oauth_token()
+            expires_at = time.time() + expires_in if expires_in else self._token_expiry(access_token)
+            
+            with self._token_lock:
+                self._cached_oauth_token = access_token
+                self._cached_oauth_exp = expires_at - TOKEN_REFRESH_MARGIN
+            return access_token
+    
+    def _token_expiry(self, token: str) -> float:
+        """Read a token's exp claim, falling back to DEFAULT_OAUTH_TOKEN_TTL."""
+        try:
+            # Only the payload segment is needed; skip PyJWT's header and
+            # signature handling since the token is not being verified
+            payload = token.split('.')[1]
+            payload += '=' * (-len(payload) % 4)
+            return float(orjson.loads(base64.urlsafe_b64decode(payload))['exp'])
+        except Exception:
+            return time.time() + DEFAULT_OAUTH_TOKEN_TTL
+    
+    def _exchange_jwt_for_oauth_token(self) -> Tuple[str, Optional[float]]:
+        """
+        Perform the JWT -> OAuth token exchange request.
+        
+        Returns:
+            (scoped access token, expires_in seconds if the server sent it)
+        """
         logger.info("Exchanging JWT for OAuth token...")
         
         jwt_token = self.generate_jwt_token()
@@ -180,7 +249,7 @@ class SnowflakeJWTAuth:
         logger.debug(f"Requesting token with role: {role}")
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 token_url,
                 headers=headers,
                 data=data,
@@ -195,7 +264,8 @@ class SnowflakeJWTAuth:
                 raise ValueError("No access_token in response")
             
             logger.info("OAuth token obtained successfully")
-            return access_token
+            expires_in = token_data.get('expires_in')
+            return access_token, float(expires_in) if expires_in else None
             
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to get OAuth token: {e}")
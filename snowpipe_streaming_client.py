@@ -1,21 +1,53 @@
-import json
 import logging
+import threading
 import time
+import orjson
 import requests
+import zstandard
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Optional
 from snowflake_jwt_auth import SnowflakeJWTAuth
 
 logger = logging.getLogger(__name__)
 
+# Snowpipe Streaming REST rejects request bodies over 4 MB
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+
+# Statuses where Snowflake rejected the request before applying it
+_UNPROCESSED_STATUSES = frozenset((429, 503))
+
+
+class SnowpipeRetry(Retry):
+    # GET/PUT retry on any transient 5xx. An append POST is replayed only when
+    # the server says it was not processed, so the same offset token is never
+    # applied twice; 502/504 are ambiguous and left to the caller's retry loop.
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method == 'POST':
+            return bool(self.total) and status_code in _UNPROCESSED_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class PartialAppendError(Exception):
+    # Raised by append_rows when some rows did not reach Snowflake. Rows in
+    # chunks that were already acknowledged are not included, so callers can
+    # retry just unsent_rows without ingesting anything twice.
+    def __init__(self, unsent_rows: List[Dict], cause: Exception):
+        super().__init__(f"{len(unsent_rows)} rows not sent: {cause}")
+        self.unsent_rows = unsent_rows
+        self.cause = cause
+
 
 class SnowpipeStreamingClient:
     
-    def __init__(self, config_path: str):
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+    def __init__(self, config_path: str, num_channels: int = 1, eager_init: bool = False):
+        self.config = orjson.loads(Path(config_path).read_bytes())
         
         self.account = self.config['account']
+        self._account_url = self._compute_account_url()
         self.user = self.config['user']
         self.database = self.config['database']
         self.schema = self.config['schema']
@@ -25,14 +57,54 @@ class SnowpipeStreamingClient:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         self.channel_name = f"{self.config.get('channel_name', 'NYC_CAM')}_{timestamp}"
         
+        # Each channel tracks its own tokens; rows are sharded across them by
+        # shard_key so a given camera always lands on the same channel
+        self.num_channels = max(1, num_channels)
+        self.shard_key = self.config.get('shard_key', 'camera_id')
+        channel_names = ([self.channel_name] if self.num_channels == 1 else
+                         [f"{self.channel_name}_{i}" for i in range(self.num_channels)])
+        self.channels = [
+            {
+                'name': name,
+                'continuation_token': None,
+                'offset_token': 0,
+                'compressor': zstandard.ZstdCompressor(level=3)
+            }
+            for name in channel_names
+        ]
+        self.executor = (ThreadPoolExecutor(max_workers=self.num_channels, thread_name_prefix='snowpipe')
+                         if self.num_channels > 1 else None)
+        
+        # Large appends go out in chunks of at most max_chunk_rows; each channel
+        # serializes its next chunk on this pool while the current one is in flight
+        self.max_chunk_rows = max(1, int(self.config.get('max_chunk_rows', 500)))
+        self.serializer = ThreadPoolExecutor(max_workers=self.num_channels, thread_name_prefix='snowpipe-encode')
+        
+        # One keep-alive pool for every Snowflake call, so each append is a single
+        # POST on an open connection instead of a fresh TCP+TLS handshake
+        self.http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(16, self.num_channels),
+            # Wait for a pooled connection rather than opening a throwaway one
+            # that urllib3 would discard (and re-handshake) once the pool is full
+            pool_block=True,
+            max_retries=SnowpipeRetry(
+                total=5,
+                backoff_factor=0.25,
+                status_forcelist=(429, 502, 503, 504),
+                respect_retry_after_header=True
+            )
+        )
+        self.http.mount('https://', adapter)
+        
         # Initialize auth with full config (supports both PAT and JWT)
-        self.auth = SnowflakeJWTAuth(self.config)
+        self.auth = SnowflakeJWTAuth(self.config, session=self.http)
         
         self.ingest_host = None
         self.scoped_token = None
-        self.continuation_token = None
-        self.offset_token = 0
         
+        self.stats_lock = threading.Lock()
         self.stats = {
             'rows_sent': 0,
             'batches': 0,
@@ -51,9 +123,32 @@ class SnowpipeStreamingClient:
         logger.info(f"Database: {self.database}")
         logger.info(f"Schema: {self.schema}")
         logger.info(f"Table: {self.table}")
-        logger.info(f"Channel: {self.channel_name}")
+        logger.info(f"Channel: {self.channel_name} ({self.num_channels} channel(s))")
+        
+        # Token, host discovery and channel open are strictly sequential, but they
+        # can run in the background while the caller finishes its own setup
+        self._connect_future: Optional[Future] = None
+        if eager_init:
+            self._connect_future = Future()
+            threading.Thread(target=self._connect_in_background, name='snowpipe-connect', daemon=True).start()
+    
+    def _connect_in_background(self):
+        try:
+            self._connect_future.set_result(self._connect())
+        except BaseException as e:
+            self._connect_future.set_exception(e)
     
-    def _get_account_url(self) -> str:
+    def _connect(self) -> dict:
+        self.discover_ingest_host()
+        return self.open_channel()
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> dict:
+        """Block until the ingest host is known and every channel is open."""
+        if self._connect_future is not None:
+            return self._connect_future.result(timeout=timeout)
+        return self._connect()
+    
+    def _compute_account_url(self) -> str:
         account_parts = self.account.lower().replace('_', '-').split('.')
         if len(account_parts) >= 2:
             return f"https://{account_parts[0]}.{account_parts[1]}.snowflakecomputing.com"
@@ -72,7 +167,7 @@ class SnowpipeStreamingClient:
         
         # Otherwise, try OAuth token exchange
         logger.info("Obtaining new scoped token via OAuth...")
-        url = f"{self._get_account_url()}/oauth/token"
+        url = f"{self._account_url}/oauth/token"
         
         headers = {
             "Authorization": self.auth.get_authorization_header(),
@@ -83,7 +178,7 @@ class SnowpipeStreamingClient:
             scope=f"session:scope:default database:{self.database} schema:{self.schema}"
         )
         
-        response = requests.post(url, headers=headers, data=payload)
+        response = self.http.post(url, headers=headers, data=payload)
         response.raise_for_status()
         
         result = response.json()
@@ -95,14 +190,14 @@ class SnowpipeStreamingClient:
         logger.info("Discovering ingest host...")
         self._get_scoped_token()
         
-        url = f"{self._get_account_url()}/v2/streaming/hostname"
+        url = f"{self._account_url}/v2/streaming/hostname"
         headers = {
             "Authorization": f"Bearer {self.scoped_token}",
             "Content-Type": "application/json"
         }
         
         logger.info(f"Calling: GET {url}")
-        response = requests.get(url, headers=headers)
+        response = self.http.get(url, headers=headers)
         
         logger.info(f"Response status: {response.status_code}")
         
@@ -133,69 +228,151 @@ class SnowpipeStreamingClient:
         if not self.ingest_host:
             self.discover_ingest_host()
         
-        logger.info(f"Opening channel: {self.channel_name}")
+        if self.executor:
+            # Channels are independent, so open them all at once
+            return list(self.executor.map(self._open_channel, self.channels))[-1]
+        return self._open_channel(self.channels[0])
+    
+    def _open_channel(self, channel: dict) -> dict:
+        logger.info(f"Opening channel: {channel['name']}")
         
         url = (f"https://{self.ingest_host}/v2/streaming/"
                f"databases/{self.database}/schemas/{self.schema}/"
-               f"pipes/{self.pipe}/channels/{self.channel_name}")
+               f"pipes/{self.pipe}/channels/{channel['name']}")
         
         headers = {
             "Authorization": f"Bearer {self.scoped_token}",
             "Content-Type": "application/json"
         }
         
-        response = requests.put(url, headers=headers, json={})
+        response = self.http.put(url, headers=headers, json={})
         response.raise_for_status()
         
         result = response.json()
-        self.continuation_token = result.get('next_continuation_token')
+        channel['continuation_token'] = result.get('next_continuation_token')
+        # Only the tokens change per append, so the path is built once here
+        channel['append_url'] = (f"https://{self.ingest_host}/v2/streaming/data/"
+                                 f"databases/{self.database}/schemas/{self.schema}/"
+                                 f"pipes/{self.pipe}/channels/{channel['name']}/rows")
         channel_status = result.get('channel_status', {})
-        self.offset_token = int(channel_status.get('last_committed_offset_token', '0') or '0')
+        channel['offset_token'] = int(channel_status.get('last_committed_offset_token', '0') or '0')
         
         logger.info("Channel opened successfully")
-        logger.info(f"Continuation token: {self.continuation_token}")
-        logger.info(f"Initial offset token: {self.offset_token}")
+        logger.info(f"Continuation token: {channel['continuation_token']}")
+        logger.info(f"Initial offset token: {channel['offset_token']}")
         
         return result
     
     def append_rows(self, rows: List[Dict]) -> dict:
-        if not self.continuation_token:
-            raise ValueError("Channel not open. Call open_channel() first.")
-        
-        logger.info(f"Appending {len(rows)} rows...")
-        
-        ndjson_payload = '\n'.join(json.dumps(row) for row in rows)
-        payload_bytes = ndjson_payload.encode('utf-8')
+        if self.num_channels == 1:
+            return self.append_rows_to(0, rows)
+        
+        shards = [[] for _ in range(self.num_channels)]
+        for row in rows:
+            shards[hash(row.get(self.shard_key)) % self.num_channels].append(row)
+        
+        # Channels are independent, so their appends can be in flight together
+        futures = [self.executor.submit(self.append_rows_to, i, shard) for i, shard in enumerate(shards)]
+        result, unsent, cause = {}, [], None
+        for future in futures:
+            try:
+                result = future.result()
+            except PartialAppendError as e:
+                unsent.extend(e.unsent_rows)
+                cause = e.cause
+        if unsent:
+            raise PartialAppendError(unsent, cause)
+        return result
+    
+    def append_rows_to(self, index: int, rows: List[Dict]) -> dict:
+        channel = self.channels[index]
+        if not rows:
+            return {}
+        
+        logger.info(f"Appending {len(rows)} rows to {channel['name']}...")
+        
+        # Posts on a channel are strictly ordered by continuation token, but the
+        # next chunk can be encoded while the current one is on the wire
+        result = {}
+        sent = 0
+        step = self.max_chunk_rows
+        try:
+            if not channel['continuation_token']:
+                raise ValueError("Channel not open. Call open_channel() first.")
+            pending = self.serializer.submit(self._encode_rows, channel, rows[:step])
+            for start in range(step, len(rows) + step, step):
+                payloads = pending.result()
+                if start < len(rows):
+                    pending = self.serializer.submit(self._encode_rows, channel, rows[start:start + step])
+                for payload_bytes, row_count in payloads:
+                    result = self._post_rows(channel, payload_bytes, row_count)
+                    sent += row_count
+        except Exception as e:
+            raise PartialAppendError(rows[sent:], e) from e
         
-        self.offset_token += 1
+        logger.info(f"Successfully appended {len(rows)} rows")
+        return result
+    
+    def _encode_rows(self, channel: dict, rows: List[Dict]) -> List[tuple]:
+        # Split on the uncompressed size so every compressed body stays under the cap
+        payloads = []
+        chunk, chunk_bytes = [], 0
+        for line in map(orjson.dumps, rows):
+            if chunk and chunk_bytes + len(line) + 1 > MAX_REQUEST_BYTES:
+                payloads.append((self._compress_lines(channel, chunk), len(chunk)))
+                chunk, chunk_bytes = [], 0
+            chunk.append(line)
+            chunk_bytes += len(line) + 1
+        if chunk:
+            payloads.append((self._compress_lines(channel, chunk), len(chunk)))
+        return payloads
+    
+    def _compress_lines(self, channel: dict, lines: List[bytes]) -> bytes:
+        # Feed the lines straight into the compressor rather than joining them
+        # first, so the uncompressed body never exists as one big buffer
+        cobj = channel['compressor'].compressobj()
+        parts = [cobj.compress(lines[0])]
+        for line in lines[1:]:
+            parts.append(cobj.compress(b'\n'))
+            parts.append(cobj.compress(line))
+        parts.append(cobj.flush())
+        return b''.join(parts)
+    
+    def _post_rows(self, channel: dict, payload_bytes: bytes, row_count: int) -> dict:
+        channel['offset_token'] += 1
         
-        url = (f"https://{self.ingest_host}/v2/streaming/data/"
-               f"databases/{self.database}/schemas/{self.schema}/"
-               f"pipes/{self.pipe}/channels/{self.channel_name}/rows"
-               f"?continuationToken={self.continuation_token}"
-               f"&offsetToken={self.offset_token}")
+        params = {
+            'continuationToken': channel['continuation_token'],
+            'offsetToken': channel['offset_token']
+        }
         
         headers = {
             "Authorization": f"Bearer {self.scoped_token}",
-            "Content-Type": "application/x-ndjson"
+            "Content-Type": "application/x-ndjson",
+            "Content-Encoding": "zstd"
         }
         
-        response = requests.post(url, headers=headers, data=payload_bytes)
+        response = self.http.post(channel['append_url'], params=params, headers=headers, data=payload_bytes)
         response.raise_for_status()
         
         result = response.json()
-        self.continuation_token = result.get('next_continuation_token')
+        channel['continuation_token'] = result.get('next_continuation_token')
         
-        self.stats['rows_sent'] += len(rows)
-        self.stats['batches'] += 1
-        self.stats['bytes_sent'] += len(payload_bytes)
+        with self.stats_lock:
+            self.stats['rows_sent'] += row_count
+            self.stats['batches'] += 1
+            self.stats['bytes_sent'] += len(payload_bytes)
         
-        logger.info(f"Successfully appended {len(rows)} rows")
         return result
     
     def close_channel(self):
-        logger.info(f"Closing channel: {self.channel_name}")
+        for channel in self.channels:
+            logger.info(f"Closing channel: {channel['name']}")
         logger.info("Channel will auto-close after inactivity period")
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        self.serializer.shutdown(wait=False)
+        self.http.close()
     
     def print_stats(self):
         elapsed = time.time() - self.stats['start_time']
@@ -209,5 +386,6 @@ class SnowpipeStreamingClient:
         logger.info(f"Elapsed time: {elapsed:.2f} seconds")
         if elapsed > 0:
             logger.info(f"Average throughput: {self.stats['rows_sent']/elapsed:.2f} rows/sec")
-        logger.info(f"Current offset token: {self.offset_token}")
+        for channel in self.channels:
+            logger.info(f"Current offset token ({channel['name']}): {channel['offset_token']}")
         logger.info("=" * 60)
@@ -7,7 +7,7 @@ Cortex AI for semantic analysis, and geospatial analytics.
 __version__ = "0.1.0"
 
 from .config import SnowflakeConfig, load_config
-from .streaming import SnowpipeStreamingClient
+from .streaming import BufferingStreamingClient, SnowpipeStreamingClient
 from .sensors import CameraSensor, TrafficEventsSensor
 from .analytics import TrafficAnalytics
 
@@ -15,6 +15,7 @@ __all__ = [
     "SnowflakeConfig",
     "load_config",
     "SnowpipeStreamingClient",
+    "BufferingStreamingClient",
     "CameraSensor",
     "TrafficEventsSensor",
     "TrafficAnalytics",
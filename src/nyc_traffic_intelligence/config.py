@@ -1,15 +1,20 @@
 """Configuration management for NYC Traffic Intelligence Platform."""
 
-import json
 import os
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import orjson
 from dotenv import load_dotenv
 
+DEFAULT_CAMERA_URL = "https://webcams.nyctmc.org/api/cameras"
+DEFAULT_EVENTS_URL = "https://511ny.org/api/getevents"
+DEFAULT_SPEEDS_URL = "https://511ny.org/api/getspeeds"
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class SnowflakeConfig:
     """Snowflake connection configuration."""
     
@@ -25,7 +30,11 @@ class SnowflakeConfig:
     
     @classmethod
     def from_env(cls) -> "SnowflakeConfig":
-        """Load configuration from environment variables."""
+        """Load configuration from environment variables (cached; see clear_config_cache)."""
+        return _snowflake_config_from_env()
+    
+    @classmethod
+    def _read_env(cls) -> "SnowflakeConfig":
         load_dotenv()
         return cls(
             account=os.getenv("SNOWFLAKE_ACCOUNT", ""),
@@ -42,9 +51,7 @@ class SnowflakeConfig:
     @classmethod
     def from_json(cls, path: str | Path) -> "SnowflakeConfig":
         """Load configuration from JSON file."""
-        with open(path) as f:
-            data = json.load(f)
-        return cls(**data)
+        return cls(**orjson.loads(Path(path).read_bytes()))
     
     @classmethod
     def from_connection_name(cls, connection_name: str) -> "SnowflakeConfig":
@@ -56,29 +63,33 @@ class SnowflakeConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class APIConfig:
     """External API configuration."""
     
-    nyc_camera_url: str = "https://webcams.nyctmc.org/api/cameras"
-    nyc_events_url: str = "https://511ny.org/api/getevents"
-    nyc_speeds_url: str = "https://511ny.org/api/getspeeds"
+    nyc_camera_url: str = DEFAULT_CAMERA_URL
+    nyc_events_url: str = DEFAULT_EVENTS_URL
+    nyc_speeds_url: str = DEFAULT_SPEEDS_URL
     noaa_weather_url: str = "https://api.weather.gov"
     slack_webhook_url: Optional[str] = None
     
     @classmethod
     def from_env(cls) -> "APIConfig":
-        """Load API configuration from environment."""
+        """Load API configuration from environment (cached; see clear_config_cache)."""
+        return _api_config_from_env()
+    
+    @classmethod
+    def _read_env(cls) -> "APIConfig":
         load_dotenv()
         return cls(
-            nyc_camera_url=os.getenv("NYC_CAMERA_URL", cls.nyc_camera_url),
-            nyc_events_url=os.getenv("NYC_EVENTS_URL", cls.nyc_events_url),
-            nyc_speeds_url=os.getenv("NYC_SPEEDS_URL", cls.nyc_speeds_url),
+            nyc_camera_url=os.getenv("NYC_CAMERA_URL", DEFAULT_CAMERA_URL),
+            nyc_events_url=os.getenv("NYC_EVENTS_URL", DEFAULT_EVENTS_URL),
+            nyc_speeds_url=os.getenv("NYC_SPEEDS_URL", DEFAULT_SPEEDS_URL),
             slack_webhook_url=os.getenv("SLACK_WEBHOOK_URL"),
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PlatformConfig:
     """Complete platform configuration."""
     
@@ -89,6 +100,24 @@ class PlatformConfig:
     enable_slack_notifications: bool = False
 
 
+# Classmethods cannot be cached directly, so from_env delegates to these.
+# The configs are frozen, so sharing one instance between callers is safe.
+@lru_cache(maxsize=1)
+def _snowflake_config_from_env() -> SnowflakeConfig:
+    return SnowflakeConfig._read_env()
+
+
+@lru_cache(maxsize=1)
+def _api_config_from_env() -> APIConfig:
+    return APIConfig._read_env()
+
+
+def clear_config_cache() -> None:
+    """Forget cached environment configuration, e.g. after a SIGHUP reload."""
+    _snowflake_config_from_env.cache_clear()
+    _api_config_from_env.cache_clear()
+
+
 def load_config(
     config_path: Optional[str | Path] = None,
     connection_name: Optional[str] = None,
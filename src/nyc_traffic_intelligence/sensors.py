@@ -5,18 +5,41 @@ import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import APIConfig
+from .utils import bulk_uuids
 
 logger = logging.getLogger(__name__)
 
 
+def _build_shared_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+# Shared by every sensor so sensors polling the same host reuse warm connections
+_SHARED_SESSION = _build_shared_session()
+
+
+def close_shared_session() -> None:
+    """Close pooled connections held by the shared sensor session."""
+    _SHARED_SESSION.close()
+
+
 class BaseSensor(ABC):
     """Base class for data sensors."""
     
+    # Key holding the record list when the API wraps it in an object
+    records_key: str = ""
+    
     def __init__(self, api_config: APIConfig | None = None):
         """Initialize sensor.
         
@@ -24,7 +47,7 @@ class BaseSensor(ABC):
             api_config: API configuration (uses defaults if not provided).
         """
         self.api_config = api_config or APIConfig()
-        self.session = requests.Session()
+        self.session = _SHARED_SESSION
         
     @abstractmethod
     def fetch(self) -> list[dict[str, Any]]:
@@ -35,6 +58,12 @@ class BaseSensor(ABC):
         """
         pass
     
+    def _records(self, data: dict | list) -> list:
+        """Return the record list from a bare-list or wrapped API response."""
+        if type(data) is list:
+            return data
+        return data.get(self.records_key) or []
+    
     def _make_request(
         self,
         url: str,
@@ -54,15 +83,20 @@ class BaseSensor(ABC):
         try:
             response = self.session.get(url, params=params, timeout=timeout)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.RequestException as e:
             logger.error(f"Request failed: {e}")
             return None
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON from {url}: {e}")
+            return None
 
 
 class CameraSensor(BaseSensor):
     """Sensor for NYC traffic camera data."""
     
+    records_key = "cameras"
+    
     def fetch(self) -> list[dict[str, Any]]:
         """Fetch camera data from NYC TMC API.
         
@@ -73,12 +107,12 @@ class CameraSensor(BaseSensor):
         if not data:
             return []
         
-        cameras = data if isinstance(data, list) else data.get("cameras", [])
-        records = []
-        
+        cameras = self._records(data)
         ts = int(time.time() * 1000)
-        for camera in cameras:
-            record = {
+        # A constant-key dict literal per row beats a table-driven
+        # comprehension over (out, src, default) tuples on CPython
+        records = [
+            {
                 "id": camera.get("id", ""),
                 "name": camera.get("name", ""),
                 "url": camera.get("url", ""),
@@ -90,9 +124,10 @@ class CameraSensor(BaseSensor):
                 "disabled": camera.get("disabled", False),
                 "blocked": camera.get("blocked", False),
                 "ts": ts,
-                "uuid": str(uuid4()),
+                "uuid": uuid,
             }
-            records.append(record)
+            for uuid, camera in zip(bulk_uuids(len(cameras)), cameras)
+        ]
             
         logger.info(f"Fetched {len(records)} cameras")
         return records
@@ -101,6 +136,8 @@ class CameraSensor(BaseSensor):
 class TrafficEventsSensor(BaseSensor):
     """Sensor for NYC traffic events data."""
     
+    records_key = "events"
+    
     def __init__(
         self,
         api_config: APIConfig | None = None,
@@ -129,12 +166,10 @@ class TrafficEventsSensor(BaseSensor):
         if not data:
             return []
         
-        events = data if isinstance(data, list) else data.get("events", [])
-        records = []
-        
+        events = self._records(data)
         ts = int(time.time() * 1000)
-        for event in events:
-            record = {
+        records = [
+            {
                 "id": event.get("ID", ""),
                 "eventtype": event.get("EventType", ""),
                 "eventsubtype": event.get("EventSubType", ""),
@@ -151,9 +186,10 @@ class TrafficEventsSensor(BaseSensor):
                 "lanesaffected": event.get("LanesAffected", ""),
                 "lanestatus": event.get("LaneStatus", ""),
                 "ts": ts,
-                "uuid": str(uuid4()),
+                "uuid": uuid,
             }
-            records.append(record)
+            for uuid, event in zip(bulk_uuids(len(events)), events)
+        ]
             
         logger.info(f"Fetched {len(records)} traffic events")
         return records
@@ -162,6 +198,8 @@ class TrafficEventsSensor(BaseSensor):
 class TrafficSpeedsSensor(BaseSensor):
     """Sensor for NYC traffic speeds data."""
     
+    records_key = "speeds"
+    
     def __init__(
         self,
         api_config: APIConfig | None = None,
@@ -190,12 +228,10 @@ class TrafficSpeedsSensor(BaseSensor):
         if not data:
             return []
         
-        speeds = data if isinstance(data, list) else data.get("speeds", [])
-        records = []
-        
+        speeds = self._records(data)
         ts = int(time.time() * 1000)
-        for speed in speeds:
-            record = {
+        records = [
+            {
                 "id": speed.get("Id", ""),
                 "linkid": speed.get("linkId", ""),
                 "speed": speed.get("Speed"),
@@ -206,9 +242,10 @@ class TrafficSpeedsSensor(BaseSensor):
                 "linkdirection": speed.get("LinkDirection", ""),
                 "linklength": speed.get("LinkLength"),
                 "ts": ts,
-                "uuid": str(uuid4()),
+                "uuid": uuid,
             }
-            records.append(record)
+            for uuid, speed in zip(bulk_uuids(len(speeds)), speeds)
+        ]
             
         logger.info(f"Fetched {len(records)} speed readings")
         return records
@@ -1,15 +1,84 @@
 """Snowpipe Streaming client for real-time data ingestion."""
 
-import json
+import atexit
+import csv
+import gzip
+import logging
+import tempfile
+import threading
 import time
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
 from typing import Any, Iterator
 from uuid import uuid4
 
+import orjson
 import snowflake.connector
 from snowflake.connector import SnowflakeConnection
+from snowflake.connector.cursor import SnowflakeCursor
 
 from .config import SnowflakeConfig
+from .utils import bulk_uuids
+
+logger = logging.getLogger(__name__)
+
+try:
+    from snowflake.ingest.streaming import StreamingIngestClient
+except ImportError:  # snowpipe-streaming ships with the optional "streaming" extra
+    StreamingIngestClient = None
+
+# Below this many rows a bound INSERT beats the PUT + COPY round trips
+BULK_LOAD_MIN_ROWS = 100
+# Rows per staged file; COPY INTO loads the files of one batch in parallel
+BULK_LOAD_FILE_ROWS = 100_000
+# Snowflake's default CSV NULL_IF marker
+_CSV_NULL = r"\N"
+
+
+@lru_cache(maxsize=32)
+def _row_getter(columns: tuple[str, ...]):
+    """Return a callable that pulls a row's values, in column order, as a tuple."""
+    getter = itemgetter(*columns)
+    if len(columns) == 1:
+        return lambda row: (getter(row),)
+    return getter
+
+
+@lru_cache(maxsize=32)
+def _build_insert_sql(table: str, columns: tuple[str, ...]) -> str:
+    """Build the bound INSERT statement for a table and column layout."""
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"""
+        INSERT INTO {table} ({", ".join(columns)})
+        VALUES ({placeholders})
+    """
+
+
+@lru_cache(maxsize=32)
+def _build_merge_sql(
+    table: str,
+    key_columns: tuple[str, ...],
+    update_columns: tuple[str, ...],
+    all_columns: tuple[str, ...],
+) -> str:
+    """Build a MERGE template; the per-call source table fills {source}."""
+    match_condition = " AND ".join(
+        f"target.{col} = source.{col}" for col in key_columns
+    )
+    update_set = ", ".join(
+        f"target.{col} = source.{col}" for col in update_columns
+    )
+    insert_columns = ", ".join(all_columns)
+    insert_values = ", ".join(f"source.{col}" for col in all_columns)
+    return f"""
+        MERGE INTO {table} AS target
+        USING {{source}} AS source
+        ON {match_condition}
+        WHEN MATCHED THEN UPDATE SET {update_set}
+        WHEN NOT MATCHED THEN INSERT ({insert_columns}) VALUES ({insert_values})
+    """
 
 
 class SnowpipeStreamingClient:
@@ -21,6 +90,9 @@ class SnowpipeStreamingClient:
         table_name: str,
         database: str | None = None,
         schema: str | None = None,
+        use_streaming: bool = False,
+        pipe_name: str | None = None,
+        profile_json: str | None = None,
     ):
         """Initialize streaming client.
         
@@ -29,12 +101,33 @@ class SnowpipeStreamingClient:
             table_name: Target table name.
             database: Override database from config.
             schema: Override schema from config.
+            use_streaming: Append rows through the Snowpipe Streaming SDK
+                instead of SQL loads (requires the "streaming" extra).
+            pipe_name: Streaming pipe (default: "<table_name>-STREAMING").
+            profile_json: SDK connection profile with the key-pair credentials.
         """
+        if use_streaming and StreamingIngestClient is None:
+            raise ImportError(
+                "use_streaming requires the snowpipe-streaming package; "
+                "install nyc-traffic-intelligence[streaming]"
+            )
         self.config = config
         self.table_name = table_name
         self.database = database or config.database
         self.schema = schema or config.schema
+        self.use_streaming = use_streaming
+        self.pipe_name = pipe_name or f"{table_name}-STREAMING"
+        self.profile_json = profile_json
         self._connection: SnowflakeConnection | None = None
+        self._cursor: SnowflakeCursor | None = None
+        self._stage_name: str | None = None
+        self._ingest_client = None
+        self._channel = None
+        self._offset_token = 0
+        # Serializes use of the shared cursor, stage and channel, since a
+        # BufferingStreamingClient flushes from its own thread; reentrant
+        # because merge_rows loads its staging table through insert_rows_bulk
+        self._lock = threading.RLock()
         
     @property
     def fully_qualified_table(self) -> str:
@@ -52,13 +145,48 @@ class SnowpipeStreamingClient:
                 schema=self.schema,
                 warehouse=self.config.warehouse,
                 role=self.config.role,
+                # Keep one authenticated session for the client's lifetime
+                client_session_keep_alive=True,
+                session_parameters={"QUERY_TAG": "nyc_traffic_intelligence"},
             )
+            # Cursors and temporary stages die with the session that created them
+            self._cursor = None
+            self._stage_name = None
         return self._connection
     
+    def _get_cursor(self) -> SnowflakeCursor:
+        """Return the client's cursor, reopening it after a reconnect."""
+        conn = self.connect()
+        if self._cursor is None:
+            self._cursor = conn.cursor()
+        return self._cursor
+    
+    def _get_channel(self):
+        """Open the SDK client and this client's channel on first use."""
+        if self._channel is None:
+            suffix = uuid4().hex[:8]
+            self._ingest_client = StreamingIngestClient(
+                f"{self.table_name}_CLIENT_{suffix}",
+                self.database,
+                self.schema,
+                self.pipe_name,
+                profile_json=self.profile_json,
+            )
+            self._channel, _ = self._ingest_client.open_channel(f"{self.table_name}_{suffix}")
+        return self._channel
+    
     def close(self) -> None:
-        """Close the connection."""
-        if self._connection and not self._connection.is_closed():
-            self._connection.close()
+        """Close the streaming channel, cursor and connection."""
+        with self._lock:
+            if self._channel is not None:
+                self._channel.close()
+                self._ingest_client.close()
+                self._channel = self._ingest_client = None
+            if self._cursor is not None:
+                self._cursor.close()
+                self._cursor = None
+            if self._connection and not self._connection.is_closed():
+                self._connection.close()
             
     def __enter__(self) -> "SnowpipeStreamingClient":
         """Context manager entry."""
@@ -76,9 +204,12 @@ class SnowpipeStreamingClient:
     ) -> int:
         """Insert rows into the target table.
         
+        Batches of at least BULK_LOAD_MIN_ROWS rows are uploaded as one file
+        and loaded with COPY INTO; smaller ones use a bound INSERT.
+        
         Args:
             rows: List of row dictionaries.
-            batch_size: Number of rows per batch.
+            batch_size: Number of rows per INSERT batch.
             
         Returns:
             Number of rows inserted.
@@ -86,26 +217,94 @@ class SnowpipeStreamingClient:
         if not rows:
             return 0
             
-        conn = self.connect()
-        cursor = conn.cursor()
+        with self._lock:
+            if self.use_streaming:
+                return self._append_streaming(rows)
+            
+            if len(rows) >= BULK_LOAD_MIN_ROWS:
+                return self.insert_rows_bulk(rows)
+            
+            cursor = self._get_cursor()
         
-        total_inserted = 0
-        for batch in self._batch_iterator(rows, batch_size):
-            columns = list(batch[0].keys())
-            placeholders = ", ".join(["%s"] * len(columns))
-            column_names = ", ".join(columns)
+            total_inserted = 0
+            # One explicit transaction, so the batches commit once and all-or-nothing
+            cursor.execute("BEGIN")
+            try:
+                for batch in self._batch_iterator(rows, batch_size):
+                    # SQL and getter are cached per column layout across calls
+                    columns = tuple(batch[0].keys())
+                    sql = _build_insert_sql(self.fully_qualified_table, columns)
+                
+                    values = list(map(_row_getter(columns), batch))
+                    cursor.executemany(sql, values)
+                    total_inserted += len(batch)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
             
-            sql = f"""
-                INSERT INTO {self.fully_qualified_table} ({column_names})
-                VALUES ({placeholders})
-            """
+            return total_inserted
+    
+    def insert_rows_bulk(
+        self,
+        rows: list[dict[str, Any]],
+        table: str | None = None,
+    ) -> int:
+        """Load rows through the client's temporary stage with COPY INTO.
+        
+        Rows that fail to load are skipped and logged rather than failing
+        the whole batch.
+        
+        Args:
+            rows: List of row dictionaries.
+            table: Fully qualified target table (default: this client's table).
             
-            values = [tuple(row[col] for col in columns) for row in batch]
-            cursor.executemany(sql, values)
-            total_inserted += len(batch)
+        Returns:
+            Number of rows loaded.
+        """
+        if not rows:
+            return 0
+        
+        with self._lock:
+            return self._copy_rows(self._get_cursor(), rows, table or self.fully_qualified_table)
+    
+    def _append_streaming(self, rows: list[dict[str, Any]]) -> int:
+        """Append rows to the streaming channel; no warehouse or SQL involved."""
+        channel = self._get_channel()
+        append_row = channel.append_row
+        offset = self._offset_token
+        for offset, row in enumerate(rows, offset + 1):
+            append_row(row, str(offset))
+        self._offset_token = offset
+        return len(rows)
+    
+    def insert_columns(self, columns: dict[str, list[Any]]) -> int:
+        """Insert column-oriented data into the target table.
+        
+        Large inputs are written column-wise to CSV and loaded with COPY INTO,
+        so no per-row dict is ever built.
+        
+        Args:
+            columns: Mapping of column name to an equal-length list of values.
             
-        cursor.close()
-        return total_inserted
+        Returns:
+            Number of rows inserted.
+        """
+        n = len(next(iter(columns.values()), ()))
+        if not n:
+            return 0
+        with self._lock:
+            if self.use_streaming:
+                names = list(columns)
+                return self._append_streaming([dict(zip(names, row)) for row in zip(*columns.values())])
+            if n < BULK_LOAD_MIN_ROWS:
+                # Zipping the columns already yields the bound value tuples
+                self._get_cursor().executemany(
+                    _build_insert_sql(self.fully_qualified_table, tuple(columns)),
+                    list(zip(*columns.values())),
+                )
+                return n
+            return self._copy_columns(self._get_cursor(), columns, self.fully_qualified_table)
     
     def insert_json(
         self,
@@ -126,15 +325,14 @@ class SnowpipeStreamingClient:
         if not records:
             return 0
             
-        rows = []
-        for record in records:
-            row = {json_column: json.dumps(record)}
-            if include_metadata:
-                row["UUID"] = str(uuid4())
-                row["TS"] = int(time.time() * 1000)
-            rows.append(row)
+        # orjson serializes in C and yields UTF-8 bytes; decode once for the VARIANT text
+        columns = {json_column: [orjson.dumps(record).decode() for record in records]}
+        if include_metadata:
+            # Every record in one call shares a single ingest timestamp
+            columns["UUID"] = bulk_uuids(len(records))
+            columns["TS"] = [int(time.time() * 1000)] * len(records)
             
-        return self.insert_rows(rows)
+        return self.insert_columns(columns)
     
     def merge_rows(
         self,
@@ -155,45 +353,148 @@ class SnowpipeStreamingClient:
         if not rows:
             return 0, 0
             
-        conn = self.connect()
-        cursor = conn.cursor()
-        
-        all_columns = list(rows[0].keys())
+        all_columns = tuple(rows[0].keys())
         if update_columns is None:
             update_columns = [c for c in all_columns if c not in key_columns]
-        
-        match_condition = " AND ".join(
-            f"target.{col} = source.{col}" for col in key_columns
-        )
-        update_set = ", ".join(
-            f"target.{col} = source.{col}" for col in update_columns
+        merge_sql = _build_merge_sql(
+            self.fully_qualified_table,
+            tuple(key_columns),
+            tuple(update_columns),
+            all_columns,
         )
-        insert_columns = ", ".join(all_columns)
-        insert_values = ", ".join(f"source.{col}" for col in all_columns)
-        
-        source_values = []
-        for row in rows:
-            values = ", ".join(
-                f"'{v}'" if isinstance(v, str) else str(v) if v is not None else "NULL"
-                for v in [row[col] for col in all_columns]
+        
+        # Stage the source rows in a session temp table rather than inlining
+        # them as literals, which grows the statement with every row
+        staging_table = f"{self.database}.{self.schema}.{self.table_name}__STG_{uuid4().hex}"
+        
+        with self._lock:
+            cursor = self._get_cursor()
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging_table} LIKE {self.fully_qualified_table}"
             )
-            source_values.append(f"SELECT {values}")
+            try:
+                self.insert_rows_bulk(rows, table=staging_table)
+                
+                cursor.execute(merge_sql.format(source=staging_table))
+                # Snowflake reports "number of rows inserted", "number of rows updated"
+                result = cursor.fetchone()
+            finally:
+                # A failed load or MERGE must not leave the staging table behind
+                # for the rest of a long-lived session
+                cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        
+        if not result:
+            return 0, 0
+        return result[0], result[1] if len(result) > 1 else 0
+    
+    def _ensure_stage(self, cursor) -> str:
+        """Create this session's temporary load stage on first use."""
+        if self._stage_name is None:
+            stage = f"{self.database}.{self.schema}.{self.table_name}__LOAD_STAGE"
+            cursor.execute(f"CREATE TEMPORARY STAGE IF NOT EXISTS {stage}")
+            self._stage_name = stage
+        return self._stage_name
+    
+    def _copy_rows(self, cursor, rows: list[dict[str, Any]], table: str) -> int:
+        """Load rows into a table with a single PUT and COPY INTO.
+        
+        Args:
+            cursor: Open cursor on the client's connection.
+            rows: List of row dictionaries.
+            table: Fully qualified target table.
+            
+        Returns:
+            Number of rows loaded.
+        """
+        stage = self._ensure_stage(cursor)
+        # Each load gets its own stage prefix so COPY only sees this batch's files
+        prefix = f"{stage}/{uuid4().hex}"
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i, chunk in enumerate(self._batch_iterator(rows, BULK_LOAD_FILE_ROWS)):
+                # Gzipped NDJSON: row keys become column names on COPY
+                with gzip.open(Path(tmp_dir) / f"part_{i:05d}.json.gz", "wb", compresslevel=1) as f:
+                    for row in chunk:
+                        f.write(orjson.dumps(row))
+                        f.write(b"\n")
+            self._put_files(cursor, tmp_dir, prefix)
         
-        source_query = " UNION ALL ".join(source_values)
+        cursor.execute(f"""
+            COPY INTO {table}
+            FROM @{prefix}/
+            FILE_FORMAT = (TYPE = JSON)
+            MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE
+            ON_ERROR = CONTINUE
+            PURGE = TRUE
+        """)
+        return self._rows_loaded(cursor)
+    
+    def _copy_columns(self, cursor, columns: dict[str, list[Any]], table: str) -> int:
+        """Load column lists into a table with a single PUT and COPY INTO.
         
-        sql = f"""
-            MERGE INTO {self.fully_qualified_table} AS target
-            USING ({source_query}) AS source({', '.join(all_columns)})
-            ON {match_condition}
-            WHEN MATCHED THEN UPDATE SET {update_set}
-            WHEN NOT MATCHED THEN INSERT ({insert_columns}) VALUES ({insert_values})
+        Args:
+            cursor: Open cursor on the client's connection.
+            columns: Mapping of column name to that column's values.
+            table: Fully qualified target table.
+            
+        Returns:
+            Number of rows loaded.
         """
+        stage = self._ensure_stage(cursor)
+        prefix = f"{stage}/{uuid4().hex}"
+        values = [
+            [_CSV_NULL if v is None else v for v in col] if None in col else col
+            for col in columns.values()
+        ]
+        n = len(values[0])
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for i, start in enumerate(range(0, n, BULK_LOAD_FILE_ROWS)):
+                end = start + BULK_LOAD_FILE_ROWS
+                path = Path(tmp_dir) / f"part_{i:05d}.csv.gz"
+                with gzip.open(path, "wt", compresslevel=1, encoding="utf-8", newline="") as f:
+                    csv.writer(f).writerows(zip(*(col[start:end] for col in values)))
+            self._put_files(cursor, tmp_dir, prefix)
         
-        cursor.execute(sql)
-        result = cursor.fetchone()
-        cursor.close()
+        cursor.execute(f"""
+            COPY INTO {table} ({", ".join(columns)})
+            FROM @{prefix}/
+            FILE_FORMAT = (
+                TYPE = CSV
+                FIELD_OPTIONALLY_ENCLOSED_BY = '"'
+                ESCAPE_UNENCLOSED_FIELD = NONE
+            )
+            ON_ERROR = CONTINUE
+            PURGE = TRUE
+        """)
+        return self._rows_loaded(cursor)
+    
+    @staticmethod
+    def _rows_loaded(cursor) -> int:
+        """Sum rows_loaded from a COPY INTO result, logging any skipped rows."""
+        names = [d[0].lower() for d in cursor.description]
+        if "rows_loaded" not in names:
+            # "Copy executed with 0 files processed." has no per-file columns
+            return 0
+        file_i, loaded_i = names.index("file"), names.index("rows_loaded")
+        errors_i, first_error_i = names.index("errors_seen"), names.index("first_error")
         
-        return result[0] if result else 0, 0
+        loaded = 0
+        for row in cursor.fetchall():
+            loaded += row[loaded_i]
+            if row[errors_i]:
+                logger.warning(
+                    f"COPY skipped {row[errors_i]} rows in {row[file_i]}: {row[first_error_i]}"
+                )
+        return loaded
+    
+    @staticmethod
+    def _put_files(cursor, local_dir: str, prefix: str) -> None:
+        """Upload every file in local_dir to a stage prefix in one PUT."""
+        cursor.execute(
+            f"PUT 'file://{Path(local_dir).as_posix()}/*' @{prefix} "
+            "AUTO_COMPRESS=FALSE PARALLEL=4"
+        )
     
     @staticmethod
     def _batch_iterator(
@@ -203,3 +504,115 @@ class SnowpipeStreamingClient:
         """Yield items in batches."""
         for i in range(0, len(items), batch_size):
             yield items[i:i + batch_size]
+
+
+class BufferingStreamingClient:
+    """Coalesces rows pushed one at a time into large insert_rows calls.
+    
+    A background thread flushes the buffer when it reaches max_rows or
+    max_bytes of serialized JSON, and otherwise every max_latency_s.
+    Remaining rows are flushed on close() and at interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        client: SnowpipeStreamingClient,
+        max_rows: int = 50_000,
+        max_bytes: int = 16 * 1024 * 1024,
+        max_latency_s: float = 5.0,
+    ):
+        """Initialize the buffer and start its flush thread.
+        
+        Args:
+            client: Client that receives the flushed batches.
+            max_rows: Flush once this many rows are buffered.
+            max_bytes: Flush once buffered rows serialize to this many bytes.
+            max_latency_s: Longest a buffered row waits for a flush.
+        """
+        self.client = client
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_latency_s = max_latency_s
+        
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._rows: list[dict[str, Any]] = []
+        self._bytes = 0
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="streaming-buffer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def push(self, row: dict[str, Any]) -> None:
+        """Buffer one row for the next flush.
+        
+        Raises:
+            RuntimeError: If the buffer has been closed.
+        """
+        size = len(orjson.dumps(row))
+        with self._lock:
+            # Checked under the lock close() sets it with, so an accepted row
+            # is always picked up by close()'s final flush
+            if self._closed.is_set():
+                raise RuntimeError("push() on a closed BufferingStreamingClient")
+            self._rows.append(row)
+            self._bytes += size
+            full = len(self._rows) >= self.max_rows or self._bytes >= self.max_bytes
+        if full:
+            self._wake.set()
+    
+    def flush(self) -> int:
+        """Send everything buffered so far.
+        
+        On failure the rows go back to the front of the buffer, ahead of
+        anything pushed meanwhile, so the next flush retries them.
+        
+        Returns:
+            Number of rows inserted.
+            
+        Raises:
+            Exception: Whatever the client's insert_rows raised.
+        """
+        # One flush at a time keeps batches in push order; the client's own
+        # lock keeps them off the cursor while the caller is using it
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                size, self._bytes = self._bytes, 0
+            if not rows:
+                return 0
+            try:
+                return self.client.insert_rows(rows)
+            except Exception:
+                with self._lock:
+                    self._rows[:0] = rows
+                    self._bytes += size
+                raise
+    
+    def close(self) -> None:
+        """Stop the flush thread and send any remaining rows.
+        
+        Raises:
+            Exception: If the final flush fails; the unsent rows are still
+                buffered, so calling flush() again retries them.
+        """
+        with self._lock:
+            if self._closed.is_set():
+                return
+            self._closed.set()
+        self._wake.set()
+        self._thread.join()
+        atexit.unregister(self.close)
+        self.flush()
+    
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.max_latency_s)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Buffered flush failed; rows kept for the next attempt")
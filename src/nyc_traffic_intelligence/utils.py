@@ -0,0 +1,17 @@
+"""Small helpers shared across the NYC Traffic Intelligence modules."""
+
+import os
+from uuid import UUID
+
+
+def bulk_uuids(n: int) -> list[str]:
+    """Generate random (version 4) UUID strings from a single urandom read.
+
+    Args:
+        n: Number of UUIDs to generate.
+
+    Returns:
+        List of ``n`` UUID strings.
+    """
+    buf = os.urandom(16 * n)
+    return [str(UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
@@ -10,98 +10,154 @@ import pandas as pd
 import pydeck as pdk
 import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
+import threading
 
 import snowflake.connector
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 
 @st.cache_resource
 def get_connection():
     return snowflake.connector.connect(
-        connection_name=os.getenv("SNOWFLAKE_CONNECTION_NAME") or "default"
+        connection_name=os.getenv("SNOWFLAKE_CONNECTION_NAME") or "default",
+        # Cached for the server's lifetime, so keep the session from expiring
+        client_session_keep_alive=True,
+        session_parameters={"QUERY_TAG": "nyc_camera_dashboard"},
     )
 
 
-@st.cache_data(ttl=60)
+def run_sql(query, params=None):
+    # fetch_pandas_all builds the DataFrame straight from the Arrow result
+    # chunks instead of materializing a Python tuple per row.
+    cur = get_connection().cursor()
+    try:
+        cur.execute(query, params)
+        return cur.fetch_pandas_all()
+    finally:
+        cur.close()
+
+
+@st.cache_data(ttl=300)
 def get_overview_stats():
-    conn = get_connection()
+    # History-wide aggregates are served from the dynamic tables in
+    # dashboard_dynamic_tables.sql. TTLs are staggered by how fast each view
+    # goes stale, so expiries don't all land on the same rerun.
     query = """
     SELECT 
-        COUNT(*) as total_records,
-        COUNT(DISTINCT camera_id) as unique_cameras,
-        COUNT(DISTINCT roadway_name) as unique_roadways,
-        MIN(image_timestamp) as first_capture,
-        MAX(image_timestamp) as last_capture
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
+        total_records, unique_cameras, unique_roadways,
+        first_capture, last_capture
+    FROM DEMO.DEMO.CAMERA_OVERVIEW_DT
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=30)
 def get_recent_cameras(limit: int = 100):
-    conn = get_connection()
-    query = f"""
+    # Pick the newest cameras with a cheap GROUP BY first, so only their
+    # latest rows are joined back instead of ranking every row in the window.
+    query = """
+    WITH latest AS (
+        SELECT camera_id, MAX(image_timestamp) as max_timestamp
+        FROM DEMO.DEMO.NYC_CAMERA_DATA
+        WHERE image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
+        GROUP BY camera_id
+        ORDER BY max_timestamp DESC
+        LIMIT %s
+    )
     SELECT 
-        camera_id, name, roadway_name, direction_of_travel,
-        latitude, longitude, video_url, image_url, image_timestamp
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    WHERE image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY camera_id ORDER BY image_timestamp DESC) = 1
-    ORDER BY image_timestamp DESC
-    LIMIT {limit}
+        c.camera_id, c.name, c.roadway_name, c.direction_of_travel,
+        c.latitude, c.longitude, c.video_url, c.image_url, c.image_timestamp
+    FROM DEMO.DEMO.NYC_CAMERA_DATA c
+    JOIN latest l
+      ON c.camera_id = l.camera_id AND c.image_timestamp = l.max_timestamp
+    WHERE c.image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY c.camera_id ORDER BY c.image_timestamp) = 1
+    ORDER BY c.image_timestamp DESC
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query, (limit,))
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=30)
+def get_map_cameras(limit: int = 100):
+    # Same as get_recent_cameras, but only cameras with coordinates inside the
+    # NYC area; BETWEEN also drops NULLs, so nothing is left to mask in pandas.
+    # Selects just what the layer and tooltip use, since pydeck serializes
+    # every column of the frame to the browser; 5 decimals (~1 m) keeps each
+    # coordinate's JSON text short.
+    query = """
+    WITH latest AS (
+        SELECT camera_id, MAX(image_timestamp) as max_timestamp
+        FROM DEMO.DEMO.NYC_CAMERA_DATA
+        WHERE image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
+          AND latitude BETWEEN 40 AND 45
+          AND longitude BETWEEN -75 AND -72
+        GROUP BY camera_id
+        ORDER BY max_timestamp DESC
+        LIMIT %s
+    )
+    SELECT 
+        c.name, c.roadway_name,
+        ROUND(c.latitude, 5) as latitude,
+        ROUND(c.longitude, 5) as longitude
+    FROM DEMO.DEMO.NYC_CAMERA_DATA c
+    JOIN latest l
+      ON c.camera_id = l.camera_id AND c.image_timestamp = l.max_timestamp
+    WHERE c.image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
+      AND c.latitude BETWEEN 40 AND 45
+      AND c.longitude BETWEEN -75 AND -72
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY c.camera_id ORDER BY c.image_timestamp) = 1
+    """
+    return run_sql(query, (limit,))
+
+
+@st.cache_data(ttl=180)
 def get_roadway_stats():
-    conn = get_connection()
     query = """
     SELECT 
-        roadway_name,
-        COUNT(DISTINCT camera_id) as camera_count,
-        COUNT(*) as total_captures,
-        ROUND(AVG(latitude), 4) as avg_latitude,
-        ROUND(AVG(longitude), 4) as avg_longitude
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    WHERE roadway_name IS NOT NULL AND roadway_name != ''
-    GROUP BY roadway_name
+        roadway_name, camera_count, total_captures,
+        avg_latitude, avg_longitude
+    FROM DEMO.DEMO.CAMERAS_BY_ROADWAY_DT
     ORDER BY camera_count DESC
     LIMIT 30
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=120)
 def get_hourly_captures():
-    conn = get_connection()
     query = """
-    SELECT 
-        DATE_TRUNC('hour', image_timestamp) as capture_hour,
-        COUNT(*) as capture_count,
-        COUNT(DISTINCT camera_id) as active_cameras
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    WHERE image_timestamp >= DATEADD('day', -7, CURRENT_TIMESTAMP())
-    GROUP BY capture_hour
+    SELECT capture_hour, capture_count
+    FROM DEMO.DEMO.CAMERA_CAPTURES_BY_HOUR_DT
+    WHERE capture_hour >= DATEADD('day', -7, CURRENT_TIMESTAMP())
     ORDER BY capture_hour
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=300)
 def get_direction_stats():
-    conn = get_connection()
     query = """
-    SELECT 
-        COALESCE(direction_of_travel, 'Unknown') as direction,
-        COUNT(DISTINCT camera_id) as camera_count,
-        COUNT(*) as total_captures
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    GROUP BY direction_of_travel
+    SELECT direction, camera_count, total_captures
+    FROM DEMO.DEMO.CAMERAS_BY_DIRECTION_DT
     ORDER BY camera_count DESC
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
+
+
+def parallel_fetch(fetchers):
+    # The queries behind the page are independent and spend their time waiting
+    # on Snowflake, so run them side by side. Worker threads inherit the
+    # script context so st.cache_data behaves as it does on the main thread.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(fetchers),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = {key: executor.submit(fetch) for key, fetch in fetchers.items()}
+        return {key: future.result() for key, future in futures.items()}
 
 
 def main():
@@ -130,41 +186,43 @@ def main():
         - **Storage**: Snowflake + Iceberg
         """)
     
-    try:
-        overview = get_overview_stats()
+    def render():
+        try:
+            # Fetch every tab's data together instead of one query per tab in turn
+            data = parallel_fetch({
+                'overview': get_overview_stats,
+                'map': get_map_cameras,
+                'hourly': get_hourly_captures,
+                'directions': get_direction_stats,
+                'cameras': get_recent_cameras,
+                'roadways': get_roadway_stats,
+            })
+            overview = data['overview']
         
-        col1, col2, col3, col4 = st.columns(4)
+            col1, col2, col3, col4 = st.columns(4)
         
-        with col1:
-            st.metric("📊 Total Records", f"{overview['TOTAL_RECORDS'].iloc[0]:,}")
-        with col2:
-            st.metric("📸 Unique Cameras", f"{overview['UNIQUE_CAMERAS'].iloc[0]:,}")
-        with col3:
-            st.metric("🛣️ Roadways", f"{overview['UNIQUE_ROADWAYS'].iloc[0]:,}")
-        with col4:
-            last_capture = overview['LAST_CAPTURE'].iloc[0]
-            if pd.notna(last_capture):
-                st.metric("⏱️ Last Capture", last_capture.strftime('%H:%M:%S'))
-            else:
-                st.metric("⏱️ Last Capture", "N/A")
+            with col1:
+                st.metric("📊 Total Records", f"{overview['TOTAL_RECORDS'].iloc[0]:,}")
+            with col2:
+                st.metric("📸 Unique Cameras", f"{overview['UNIQUE_CAMERAS'].iloc[0]:,}")
+            with col3:
+                st.metric("🛣️ Roadways", f"{overview['UNIQUE_ROADWAYS'].iloc[0]:,}")
+            with col4:
+                last_capture = overview['LAST_CAPTURE'].iloc[0]
+                if pd.notna(last_capture):
+                    st.metric("⏱️ Last Capture", last_capture.strftime('%H:%M:%S'))
+                else:
+                    st.metric("⏱️ Last Capture", "N/A")
         
-        st.markdown("---")
+            st.markdown("---")
         
-        tab1, tab2, tab3, tab4 = st.tabs(["🗺️ Map", "📈 Analytics", "📋 Camera List", "📊 Roadways"])
+            tab1, tab2, tab3, tab4 = st.tabs(["🗺️ Map", "📈 Analytics", "📋 Camera List", "📊 Roadways"])
         
-        with tab1:
-            st.subheader("Camera Locations Map")
+            with tab1:
+                st.subheader("Camera Locations Map")
             
-            cameras = get_recent_cameras()
+                map_data = data['map']
             
-            if not cameras.empty and 'LATITUDE' in cameras.columns:
-                map_data = cameras[
-                    cameras['LATITUDE'].notna() & 
-                    cameras['LONGITUDE'].notna() &
-                    (cameras['LATITUDE'].between(40, 45)) &
-                    (cameras['LONGITUDE'].between(-75, -72))
-                ].copy()
-                
                 if not map_data.empty:
                     view_state = pdk.ViewState(
                         latitude=map_data['LATITUDE'].mean(),
@@ -172,7 +230,7 @@ def main():
                         zoom=9,
                         pitch=0
                     )
-                    
+                
                     layer = pdk.Layer(
                         'ScatterplotLayer',
                         data=map_data,
@@ -181,86 +239,85 @@ def main():
                         get_radius=500,
                         pickable=True
                     )
-                    
+                
                     deck = pdk.Deck(
                         layers=[layer],
                         initial_view_state=view_state,
                         tooltip={"text": "{NAME}\n{ROADWAY_NAME}"}
                     )
-                    
+                
                     st.pydeck_chart(deck)
                 else:
                     st.warning("No valid camera locations to display")
-            else:
-                st.warning("No camera data available")
         
-        with tab2:
-            st.subheader("Data Analytics")
+            with tab2:
+                st.subheader("Data Analytics")
             
-            col1, col2 = st.columns(2)
+                col1, col2 = st.columns(2)
             
-            with col1:
-                hourly = get_hourly_captures()
-                if not hourly.empty:
-                    fig = px.line(
-                        hourly, 
-                        x='CAPTURE_HOUR', 
-                        y='CAPTURE_COUNT',
-                        title='Captures Over Time',
-                        labels={'CAPTURE_HOUR': 'Time', 'CAPTURE_COUNT': 'Captures'}
-                    )
-                    fig.update_layout(height=350)
-                    st.plotly_chart(fig, use_container_width=True)
+                with col1:
+                    hourly = data['hourly']
+                    if not hourly.empty:
+                        fig = px.line(
+                            hourly, 
+                            x='CAPTURE_HOUR', 
+                            y='CAPTURE_COUNT',
+                            title='Captures Over Time',
+                            labels={'CAPTURE_HOUR': 'Time', 'CAPTURE_COUNT': 'Captures'}
+                        )
+                        fig.update_layout(height=350)
+                        st.plotly_chart(fig, use_container_width=True)
             
-            with col2:
-                directions = get_direction_stats()
-                if not directions.empty:
-                    fig = px.pie(
-                        directions,
-                        values='CAMERA_COUNT',
-                        names='DIRECTION',
-                        title='Cameras by Direction'
-                    )
-                    fig.update_layout(height=350)
-                    st.plotly_chart(fig, use_container_width=True)
+                with col2:
+                    directions = data['directions']
+                    if not directions.empty:
+                        fig = px.pie(
+                            directions,
+                            values='CAMERA_COUNT',
+                            names='DIRECTION',
+                            title='Cameras by Direction'
+                        )
+                        fig.update_layout(height=350)
+                        st.plotly_chart(fig, use_container_width=True)
         
-        with tab3:
-            st.subheader("Recent Camera Data")
+            with tab3:
+                st.subheader("Recent Camera Data")
             
-            cameras = get_recent_cameras()
-            if not cameras.empty:
-                display_cols = ['CAMERA_ID', 'NAME', 'ROADWAY_NAME', 
-                               'DIRECTION_OF_TRAVEL', 'IMAGE_TIMESTAMP']
-                available_cols = [c for c in display_cols if c in cameras.columns]
-                st.dataframe(cameras[available_cols], use_container_width=True)
-            else:
-                st.info("No recent camera data available")
+                cameras = data['cameras']
+                if not cameras.empty:
+                    display_cols = ['CAMERA_ID', 'NAME', 'ROADWAY_NAME', 
+                                   'DIRECTION_OF_TRAVEL', 'IMAGE_TIMESTAMP']
+                    available_cols = [c for c in display_cols if c in cameras.columns]
+                    st.dataframe(cameras[available_cols], use_container_width=True)
+                else:
+                    st.info("No recent camera data available")
         
-        with tab4:
-            st.subheader("Roadway Statistics")
+            with tab4:
+                st.subheader("Roadway Statistics")
             
-            roadways = get_roadway_stats()
-            if not roadways.empty:
-                fig = px.bar(
-                    roadways.head(20),
-                    x='CAMERA_COUNT',
-                    y='ROADWAY_NAME',
-                    orientation='h',
-                    title='Top 20 Roadways by Camera Count',
-                    labels={'CAMERA_COUNT': 'Cameras', 'ROADWAY_NAME': 'Roadway'}
-                )
-                fig.update_layout(height=600, yaxis={'categoryorder': 'total ascending'})
-                st.plotly_chart(fig, use_container_width=True)
-        
-        if auto_refresh:
-            import time
-            time.sleep(60)
-            st.cache_data.clear()
-            st.rerun()
+                roadways = data['roadways']
+                if not roadways.empty:
+                    fig = px.bar(
+                        roadways.head(20),
+                        x='CAMERA_COUNT',
+                        y='ROADWAY_NAME',
+                        orientation='h',
+                        title='Top 20 Roadways by Camera Count',
+                        labels={'CAMERA_COUNT': 'Cameras', 'ROADWAY_NAME': 'Roadway'}
+                    )
+                    fig.update_layout(height=600, yaxis={'categoryorder': 'total ascending'})
+                    st.plotly_chart(fig, use_container_width=True)
+    
+        except Exception as e:
+            st.error(f"Error loading data: {e}")
+            st.info("Make sure Snowflake connection is configured properly.")
+    
+    if auto_refresh:
+        # Rerun the dashboard every minute without holding the session
+        # thread; each query's TTL decides what is refetched.
+        render = st.fragment(run_every=60)(render)
     
-    except Exception as e:
-        st.error(f"Error loading data: {e}")
-        st.info("Make sure Snowflake connection is configured properly.")
+    render()
 
 
 if __name__ == "__main__":
@@ -12,148 +12,167 @@ import pandas as pd
 import pydeck as pdk
 import plotly.express as px
 import plotly.graph_objects as go
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
+import threading
 
 import snowflake.connector
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 
 @st.cache_resource
 def get_connection():
+    # One raw connector connection per server process, shared by the fetch
+    # threads; each query opens its own cursor on it.
     return snowflake.connector.connect(
-        connection_name=os.getenv("SNOWFLAKE_CONNECTION_NAME") or "default"
+        connection_name=os.getenv("SNOWFLAKE_CONNECTION_NAME") or "default",
+        client_session_keep_alive=True,
+        session_parameters={"QUERY_TAG": "nyc_dashboard"}
     )
 
 
-@st.cache_data(ttl=60)
-def get_camera_stats():
-    conn = get_connection()
-    query = """
-    SELECT 
-        COUNT(*) as total_records,
-        COUNT(DISTINCT camera_id) as unique_cameras,
-        COUNT(DISTINCT roadway_name) as unique_roadways,
-        MAX(image_timestamp) as last_capture
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    """
-    return pd.read_sql(query, conn)
+def shrink(df):
+    # Snowflake hands back 64-bit numbers; the charts and maps are happy
+    # with half the width, which halves what gets serialized to the browser.
+    for col in df.select_dtypes('float64').columns:
+        df[col] = df[col].astype('float32')
+    for col in df.select_dtypes('int64').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
 
 
-@st.cache_data(ttl=60)
-def get_event_stats():
-    conn = get_connection()
-    query = """
-    SELECT 
-        COUNT(*) as total_events,
-        COUNT(DISTINCT event_id) as unique_events,
-        COUNT(DISTINCT event_type) as event_types,
-        MAX(event_timestamp) as last_event
-    FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
-    """
-    return pd.read_sql(query, conn)
+def run_sql(query):
+    # fetch_pandas_all builds the DataFrame straight from the Arrow result
+    # chunks instead of materializing a Python tuple per row.
+    cur = get_connection().cursor()
+    try:
+        cur.execute(query)
+        return shrink(cur.fetch_pandas_all())
+    finally:
+        cur.close()
 
 
-@st.cache_data(ttl=60)
-def get_speed_stats():
-    conn = get_connection()
+@st.cache_data(ttl=120)
+def get_overview_stats():
     query = """
-    SELECT 
-        COUNT(*) as total_readings,
-        COUNT(DISTINCT segment_id) as unique_segments,
-        ROUND(AVG(current_speed), 1) as avg_speed,
-        ROUND(AVG(CASE WHEN free_flow_speed > 0 
-              THEN current_speed / free_flow_speed ELSE NULL END) * 100, 1) as avg_flow_pct,
-        MAX(traffic_timestamp) as last_reading
-    FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
+    WITH cameras AS (
+        SELECT 
+            COUNT(*) as total_records,
+            COUNT(DISTINCT camera_id) as unique_cameras,
+            COUNT(DISTINCT roadway_name) as unique_roadways,
+            MAX(image_timestamp) as last_capture
+        FROM DEMO.DEMO.NYC_CAMERA_DATA
+    ),
+    events AS (
+        SELECT 
+            COUNT(*) as total_events,
+            COUNT(DISTINCT event_id) as unique_events,
+            COUNT(DISTINCT event_type) as event_types,
+            MAX(event_timestamp) as last_event
+        FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
+    ),
+    speeds AS (
+        SELECT 
+            COUNT(*) as total_readings,
+            COUNT(DISTINCT segment_id) as unique_segments,
+            ROUND(AVG(current_speed), 1) as avg_speed,
+            ROUND(AVG(CASE WHEN free_flow_speed > 0 
+                  THEN current_speed / free_flow_speed ELSE NULL END) * 100, 1) as avg_flow_pct,
+            MAX(traffic_timestamp) as last_reading
+        FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
+    )
+    SELECT * FROM cameras, events, speeds
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=30)
 def get_recent_events(limit: int = 200):
-    conn = get_connection()
-    query = f"""
+    # Always ask Snowflake for the same 500 rows so every caller shares one
+    # result-cache entry; the caller's limit is applied here.
+    query = """
     SELECT 
         event_id, event_type, event_subtype, severity,
         roadway_name, direction, description, location,
         latitude, longitude, event_timestamp
     FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
     WHERE event_timestamp >= DATEADD('day', -7, CURRENT_TIMESTAMP())
+      AND latitude IS NOT NULL AND longitude IS NOT NULL
+      AND latitude BETWEEN 40 AND 45 AND longitude BETWEEN -76 AND -72
     ORDER BY event_timestamp DESC
-    LIMIT {limit}
+    LIMIT 500
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query).head(limit)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=120)
 def get_event_type_distribution():
-    conn = get_connection()
+    # History-wide aggregates are served from the dynamic tables in
+    # dashboard_dynamic_tables.sql; the TTL tracks their 2 minute lag.
     query = """
-    SELECT 
-        event_type,
-        COUNT(*) as event_count
-    FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
-    GROUP BY event_type
+    SELECT event_type, event_count
+    FROM DEMO.DEMO.EVENTS_BY_TYPE_DT
     ORDER BY event_count DESC
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=120)
 def get_events_by_roadway():
-    conn = get_connection()
     query = """
-    SELECT 
-        roadway_name,
-        COUNT(*) as event_count,
-        COUNT(DISTINCT event_type) as event_types
-    FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
-    WHERE roadway_name IS NOT NULL AND roadway_name != ''
-    GROUP BY roadway_name
+    SELECT roadway_name, event_count, event_types
+    FROM DEMO.DEMO.EVENTS_BY_ROADWAY_DT
     ORDER BY event_count DESC
     LIMIT 20
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=120)
 def get_events_by_severity():
-    conn = get_connection()
     query = """
-    SELECT 
-        COALESCE(severity, 'Unknown') as severity,
-        COUNT(*) as event_count
-    FROM DEMO.DEMO.NYC_TRAFFIC_EVENTS
-    GROUP BY severity
+    SELECT severity, event_count
+    FROM DEMO.DEMO.EVENTS_BY_SEVERITY_DT
     ORDER BY event_count DESC
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=30)
 def get_speed_data(limit: int = 500):
-    conn = get_connection()
-    query = f"""
+    query = """
+    WITH recent AS (
+        SELECT *
+        FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
+        WHERE traffic_timestamp >= DATEADD('hour', -6, CURRENT_TIMESTAMP())
+    ),
+    latest AS (
+        SELECT segment_id, MAX(traffic_timestamp) as max_timestamp
+        FROM recent
+        GROUP BY segment_id
+    )
     SELECT 
-        segment_id, roadway_name, direction,
-        from_location, to_location,
-        current_speed, free_flow_speed, travel_time,
-        CASE WHEN free_flow_speed > 0 
-             THEN ROUND((current_speed / free_flow_speed) * 100, 1) 
+        r.segment_id, r.roadway_name, r.direction,
+        r.from_location, r.to_location,
+        r.current_speed, r.free_flow_speed, r.travel_time,
+        CASE WHEN r.free_flow_speed > 0 
+             THEN ROUND((r.current_speed / r.free_flow_speed) * 100, 1) 
              ELSE NULL END as flow_percentage,
-        traffic_timestamp
-    FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY segment_id ORDER BY traffic_timestamp DESC) = 1
-    ORDER BY traffic_timestamp DESC
-    LIMIT {limit}
+        r.traffic_timestamp
+    FROM recent r
+    JOIN latest l
+      ON r.segment_id = l.segment_id AND r.traffic_timestamp = l.max_timestamp
+    ORDER BY r.traffic_timestamp DESC
+    LIMIT 500
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query).head(limit)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=30)
 def get_slowest_segments(limit: int = 20):
-    conn = get_connection()
-    query = f"""
+    query = """
     SELECT 
         segment_id, roadway_name, direction,
         from_location, to_location,
@@ -168,45 +187,81 @@ def get_slowest_segments(limit: int = 20):
     GROUP BY segment_id, roadway_name, direction, from_location, to_location
     HAVING COUNT(*) >= 2
     ORDER BY flow_pct ASC
-    LIMIT {limit}
+    LIMIT 500
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query).head(limit)
 
 
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=120)
 def get_speed_by_roadway():
-    conn = get_connection()
     query = """
-    SELECT 
-        roadway_name,
-        ROUND(AVG(current_speed), 1) as avg_speed,
-        ROUND(AVG(free_flow_speed), 1) as avg_free_flow,
-        ROUND(AVG(CASE WHEN free_flow_speed > 0 
-                  THEN current_speed / free_flow_speed ELSE NULL END) * 100, 1) as flow_pct,
-        COUNT(DISTINCT segment_id) as segments
-    FROM DEMO.DEMO.NYC_TRAFFIC_SPEEDS
-    WHERE roadway_name IS NOT NULL AND roadway_name != ''
-    GROUP BY roadway_name
+    SELECT roadway_name, avg_speed, avg_free_flow, flow_pct, segments
+    FROM DEMO.DEMO.SPEED_BY_ROADWAY_DT
     ORDER BY segments DESC
     LIMIT 25
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
 
 
-@st.cache_data(ttl=60)
-def get_cameras():
-    conn = get_connection()
+@st.cache_data(ttl=120)
+def get_flow_histogram():
+    # Bin the roadway flow percentages in Snowflake; each row is one
+    # 5-point bucket keyed by its midpoint.
     query = """
     SELECT 
-        camera_id, name, roadway_name, direction_of_travel,
-        latitude, longitude, image_url, image_timestamp
-    FROM DEMO.DEMO.NYC_CAMERA_DATA
-    WHERE image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY camera_id ORDER BY image_timestamp DESC) = 1
-    ORDER BY image_timestamp DESC
+        (WIDTH_BUCKET(flow_pct, 0, 100, 20) - 0.5) * 5 as flow_pct,
+        COUNT(*) as roadways
+    FROM (
+        SELECT flow_pct
+        FROM DEMO.DEMO.SPEED_BY_ROADWAY_DT
+        ORDER BY segments DESC
+        LIMIT 25
+    )
+    WHERE flow_pct IS NOT NULL
+    GROUP BY 1
+    ORDER BY 1
+    """
+    return run_sql(query)
+
+
+@st.cache_data(ttl=30)
+def get_cameras():
+    query = """
+    WITH recent AS (
+        SELECT 
+            camera_id, name, roadway_name, direction_of_travel,
+            latitude, longitude, image_url, image_timestamp
+        FROM DEMO.DEMO.NYC_CAMERA_DATA
+        WHERE image_timestamp >= DATEADD('hour', -24, CURRENT_TIMESTAMP())
+          AND latitude IS NOT NULL AND longitude IS NOT NULL
+          AND latitude BETWEEN 40 AND 45 AND longitude BETWEEN -76 AND -72
+    ),
+    latest AS (
+        SELECT camera_id, MAX(image_timestamp) as max_timestamp
+        FROM recent
+        GROUP BY camera_id
+    )
+    SELECT r.*
+    FROM recent r
+    JOIN latest l
+      ON r.camera_id = l.camera_id AND r.image_timestamp = l.max_timestamp
+    ORDER BY r.image_timestamp DESC
     LIMIT 100
     """
-    return pd.read_sql(query, conn)
+    return run_sql(query)
+
+
+def parallel_fetch(fetchers):
+    # The queries behind a view are independent and spend their time waiting
+    # on Snowflake, so run them side by side. Worker threads inherit the
+    # script context so st.cache_data behaves as it does on the main thread.
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(fetchers),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    ) as executor:
+        futures = {key: executor.submit(fetch) for key, fetch in fetchers.items()}
+        return {key: future.result() for key, future in futures.items()}
 
 
 def render_header():
@@ -269,24 +324,25 @@ def render_sidebar():
         return selected_view, auto_refresh
 
 
-def render_overview():
+def render_overview(stats):
     st.header("📊 Traffic Overview")
     
     try:
-        camera_stats = get_camera_stats()
-        event_stats = get_event_stats()
-        speed_stats = get_speed_stats()
+        data = parallel_fetch({
+            'events_dist': get_event_type_distribution,
+            'speed_roadway': get_speed_by_roadway,
+        })
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📷 Cameras", f"{camera_stats['UNIQUE_CAMERAS'].iloc[0]:,}" if camera_stats['UNIQUE_CAMERAS'].iloc[0] else "0")
+            st.metric("📷 Cameras", f"{stats['UNIQUE_CAMERAS']:,}" if stats['UNIQUE_CAMERAS'] else "0")
         with col2:
-            st.metric("🚨 Events", f"{event_stats['UNIQUE_EVENTS'].iloc[0]:,}" if event_stats['UNIQUE_EVENTS'].iloc[0] else "0")
+            st.metric("🚨 Events", f"{stats['UNIQUE_EVENTS']:,}" if stats['UNIQUE_EVENTS'] else "0")
         with col3:
-            st.metric("🛣️ Segments", f"{speed_stats['UNIQUE_SEGMENTS'].iloc[0]:,}" if speed_stats['UNIQUE_SEGMENTS'].iloc[0] else "0")
+            st.metric("🛣️ Segments", f"{stats['UNIQUE_SEGMENTS']:,}" if stats['UNIQUE_SEGMENTS'] else "0")
         with col4:
-            flow = speed_stats['AVG_FLOW_PCT'].iloc[0]
+            flow = stats['AVG_FLOW_PCT']
             st.metric("🏎️ Avg Flow", f"{flow}%" if flow else "N/A")
         
         st.markdown("---")
@@ -295,7 +351,7 @@ def render_overview():
         
         with col1:
             st.subheader("🚨 Events by Type")
-            events_dist = get_event_type_distribution()
+            events_dist = data['events_dist']
             if not events_dist.empty:
                 fig = px.pie(
                     events_dist,
@@ -310,7 +366,7 @@ def render_overview():
         
         with col2:
             st.subheader("🏎️ Speed by Roadway")
-            speed_roadway = get_speed_by_roadway()
+            speed_roadway = data['speed_roadway']
             if not speed_roadway.empty:
                 fig = px.bar(
                     speed_roadway.head(15),
@@ -330,21 +386,26 @@ def render_overview():
         st.error(f"Error loading overview: {e}")
 
 
-def render_events():
+def render_events(stats):
     st.header("🚨 Traffic Events")
     
     try:
         col1, col2, col3, col4 = st.columns(4)
         
-        event_stats = get_event_stats()
+        data = parallel_fetch({
+            'events': lambda: get_recent_events(200),
+            'events_dist': get_event_type_distribution,
+            'severity': get_events_by_severity,
+            'roadways': get_events_by_roadway,
+        })
         with col1:
-            st.metric("Total Events", f"{event_stats['TOTAL_EVENTS'].iloc[0]:,}" if event_stats['TOTAL_EVENTS'].iloc[0] else "0")
+            st.metric("Total Events", f"{stats['TOTAL_EVENTS']:,}" if stats['TOTAL_EVENTS'] else "0")
         with col2:
-            st.metric("Unique Events", f"{event_stats['UNIQUE_EVENTS'].iloc[0]:,}" if event_stats['UNIQUE_EVENTS'].iloc[0] else "0")
+            st.metric("Unique Events", f"{stats['UNIQUE_EVENTS']:,}" if stats['UNIQUE_EVENTS'] else "0")
         with col3:
-            st.metric("Event Types", f"{event_stats['EVENT_TYPES'].iloc[0]}" if event_stats['EVENT_TYPES'].iloc[0] else "0")
+            st.metric("Event Types", f"{stats['EVENT_TYPES']}" if stats['EVENT_TYPES'] else "0")
         with col4:
-            last = event_stats['LAST_EVENT'].iloc[0]
+            last = stats['LAST_EVENT']
             st.metric("Last Event", last.strftime('%H:%M') if pd.notna(last) else "N/A")
         
         st.markdown("---")
@@ -352,26 +413,19 @@ def render_events():
         tab1, tab2, tab3, tab4 = st.tabs(["🗺️ Event Map", "📊 Analytics", "📋 Event List", "🏆 Top Roadways"])
         
         with tab1:
-            events = get_recent_events()
+            events = data['events']
             if not events.empty:
-                map_data = events[
-                    events['LATITUDE'].notna() & 
-                    events['LONGITUDE'].notna() &
-                    (events['LATITUDE'].between(40, 45)) &
-                    (events['LONGITUDE'].between(-76, -72))
-                ].copy()
+                color_map = defaultdict(lambda: [128, 128, 128, 200], {
+                    'incident': [255, 0, 0, 200],
+                    'construction': [255, 165, 0, 200],
+                    'special_event': [0, 100, 255, 200],
+                    'road_work': [255, 200, 0, 200]
+                })
+                map_data = events.loc[:, ['LONGITUDE', 'LATITUDE', 'EVENT_TYPE', 'DESCRIPTION', 'ROADWAY_NAME']].assign(
+                    color=events['EVENT_TYPE'].astype(str).str.lower().map(color_map)
+                )
                 
                 if not map_data.empty:
-                    color_map = {
-                        'incident': [255, 0, 0, 200],
-                        'construction': [255, 165, 0, 200],
-                        'special_event': [0, 100, 255, 200],
-                        'road_work': [255, 200, 0, 200]
-                    }
-                    map_data['color'] = map_data['EVENT_TYPE'].apply(
-                        lambda x: color_map.get(str(x).lower(), [128, 128, 128, 200])
-                    )
-                    
                     view_state = pdk.ViewState(
                         latitude=map_data['LATITUDE'].mean(),
                         longitude=map_data['LONGITUDE'].mean(),
@@ -404,7 +458,7 @@ def render_events():
             col1, col2 = st.columns(2)
             
             with col1:
-                events_dist = get_event_type_distribution()
+                events_dist = data['events_dist']
                 if not events_dist.empty:
                     fig = px.bar(
                         events_dist,
@@ -418,7 +472,7 @@ def render_events():
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                severity = get_events_by_severity()
+                severity = data['severity']
                 if not severity.empty:
                     fig = px.pie(
                         severity,
@@ -431,7 +485,7 @@ def render_events():
                     st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
-            events = get_recent_events(100)
+            events = data['events'].head(100)
             if not events.empty:
                 display_cols = ['EVENT_TYPE', 'SEVERITY', 'ROADWAY_NAME', 'DESCRIPTION', 'EVENT_TIMESTAMP']
                 available = [c for c in display_cols if c in events.columns]
@@ -440,7 +494,7 @@ def render_events():
                 st.info("No events to display")
         
         with tab4:
-            roadways = get_events_by_roadway()
+            roadways = data['roadways']
             if not roadways.empty:
                 fig = px.bar(
                     roadways,
@@ -459,21 +513,26 @@ def render_events():
         st.error(f"Error loading events: {e}")
 
 
-def render_speeds():
+def render_speeds(stats):
     st.header("🏎️ Traffic Speeds")
     
     try:
-        speed_stats = get_speed_stats()
+        data = parallel_fetch({
+            'slowest': get_slowest_segments,
+            'speed_roadway': get_speed_by_roadway,
+            'flow_histogram': get_flow_histogram,
+            'speeds': lambda: get_speed_data(200),
+        })
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Readings", f"{speed_stats['TOTAL_READINGS'].iloc[0]:,}" if speed_stats['TOTAL_READINGS'].iloc[0] else "0")
+            st.metric("Total Readings", f"{stats['TOTAL_READINGS']:,}" if stats['TOTAL_READINGS'] else "0")
         with col2:
-            st.metric("Segments", f"{speed_stats['UNIQUE_SEGMENTS'].iloc[0]:,}" if speed_stats['UNIQUE_SEGMENTS'].iloc[0] else "0")
+            st.metric("Segments", f"{stats['UNIQUE_SEGMENTS']:,}" if stats['UNIQUE_SEGMENTS'] else "0")
         with col3:
-            st.metric("Avg Speed", f"{speed_stats['AVG_SPEED'].iloc[0]} mph" if speed_stats['AVG_SPEED'].iloc[0] else "N/A")
+            st.metric("Avg Speed", f"{stats['AVG_SPEED']} mph" if stats['AVG_SPEED'] else "N/A")
         with col4:
-            flow = speed_stats['AVG_FLOW_PCT'].iloc[0]
+            flow = stats['AVG_FLOW_PCT']
             color = "normal" if flow and flow > 75 else "inverse"
             st.metric("Avg Flow", f"{flow}%" if flow else "N/A")
         
@@ -483,7 +542,7 @@ def render_speeds():
         
         with tab1:
             st.subheader("🐢 Slowest Segments (Last 6 Hours)")
-            slowest = get_slowest_segments()
+            slowest = data['slowest']
             if not slowest.empty:
                 fig = px.bar(
                     slowest,
@@ -510,7 +569,7 @@ def render_speeds():
             col1, col2 = st.columns(2)
             
             with col1:
-                speed_roadway = get_speed_by_roadway()
+                speed_roadway = data['speed_roadway']
                 if not speed_roadway.empty:
                     fig = px.scatter(
                         speed_roadway,
@@ -533,22 +592,24 @@ def render_speeds():
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
-                if not speed_roadway.empty:
-                    fig = px.histogram(
-                        speed_roadway,
+                flow_histogram = data['flow_histogram']
+                if not flow_histogram.empty:
+                    fig = px.bar(
+                        flow_histogram,
                         x='FLOW_PCT',
-                        nbins=20,
+                        y='ROADWAYS',
                         title='Flow Percentage Distribution',
-                        labels={'FLOW_PCT': 'Flow %', 'count': 'Roadways'},
+                        labels={'FLOW_PCT': 'Flow %', 'ROADWAYS': 'Roadways'},
                         color_discrete_sequence=['#ff6b35']
                     )
+                    fig.update_traces(width=5)
                     fig.add_vline(x=75, line_dash="dash", line_color="green", annotation_text="Good Flow")
                     fig.add_vline(x=50, line_dash="dash", line_color="red", annotation_text="Congested")
                     fig.update_layout(height=400)
                     st.plotly_chart(fig, use_container_width=True)
         
         with tab3:
-            speeds = get_speed_data(200)
+            speeds = data['speeds']
             if not speeds.empty:
                 st.dataframe(speeds, use_container_width=True, height=500)
     
@@ -556,37 +617,34 @@ def render_speeds():
         st.error(f"Error loading speeds: {e}")
 
 
-def render_cameras():
+def render_cameras(stats):
     st.header("📷 Traffic Cameras")
     
     try:
-        camera_stats = get_camera_stats()
+        data = parallel_fetch({
+            'cameras': get_cameras,
+        })
         
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Records", f"{camera_stats['TOTAL_RECORDS'].iloc[0]:,}" if camera_stats['TOTAL_RECORDS'].iloc[0] else "0")
+            st.metric("Total Records", f"{stats['TOTAL_RECORDS']:,}" if stats['TOTAL_RECORDS'] else "0")
         with col2:
-            st.metric("Unique Cameras", f"{camera_stats['UNIQUE_CAMERAS'].iloc[0]:,}" if camera_stats['UNIQUE_CAMERAS'].iloc[0] else "0")
+            st.metric("Unique Cameras", f"{stats['UNIQUE_CAMERAS']:,}" if stats['UNIQUE_CAMERAS'] else "0")
         with col3:
-            st.metric("Roadways", f"{camera_stats['UNIQUE_ROADWAYS'].iloc[0]:,}" if camera_stats['UNIQUE_ROADWAYS'].iloc[0] else "0")
+            st.metric("Roadways", f"{stats['UNIQUE_ROADWAYS']:,}" if stats['UNIQUE_ROADWAYS'] else "0")
         with col4:
-            last = camera_stats['LAST_CAPTURE'].iloc[0]
+            last = stats['LAST_CAPTURE']
             st.metric("Last Capture", last.strftime('%H:%M:%S') if pd.notna(last) else "N/A")
         
         st.markdown("---")
         
-        cameras = get_cameras()
+        cameras = data['cameras']
         
         if not cameras.empty:
             tab1, tab2 = st.tabs(["🗺️ Camera Map", "📋 Camera List"])
             
             with tab1:
-                map_data = cameras[
-                    cameras['LATITUDE'].notna() & 
-                    cameras['LONGITUDE'].notna() &
-                    (cameras['LATITUDE'].between(40, 45)) &
-                    (cameras['LONGITUDE'].between(-76, -72))
-                ].copy()
+                map_data = cameras.loc[:, ['LONGITUDE', 'LATITUDE', 'NAME', 'ROADWAY_NAME']]
                 
                 if not map_data.empty:
                     view_state = pdk.ViewState(
@@ -629,19 +687,30 @@ def main():
     selected_view, auto_refresh = render_sidebar()
     
     if selected_view == "📊 Overview":
-        render_overview()
+        render_view = render_overview
     elif selected_view == "🚨 Traffic Events":
-        render_events()
+        render_view = render_events
     elif selected_view == "🏎️ Traffic Speeds":
-        render_speeds()
+        render_view = render_speeds
     elif selected_view == "📷 Cameras":
-        render_cameras()
+        render_view = render_cameras
+    
+    def render():
+        # Every view shows the same overview counters, so fetch them once
+        # here and hand the row to the view as a plain dict.
+        try:
+            stats = get_overview_stats().iloc[0].to_dict()
+        except Exception as e:
+            st.error(f"Error loading stats: {e}")
+            return
+        render_view(stats)
     
     if auto_refresh:
-        import time
-        time.sleep(60)
-        st.cache_data.clear()
-        st.rerun()
+        # Rerun just the selected view every minute without holding the
+        # session thread; each query's TTL decides what is refetched.
+        render = st.fragment(run_every=60)(render)
+    
+    render()
 
 
 if __name__ == "__main__":